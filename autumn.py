@@ -2,6 +2,31 @@ import sys
 import os
 import datetime
 import json
+import hashlib
+import time
+import contextlib
+import shlex
+import shutil
+import csv
+import signal
+import socket
+import select
+import subprocess
+import struct
+import ctypes
+import ctypes.util
+import gzip
+import mimetypes
+import asyncio
+import ssl
+import fnmatch
+import atexit
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+if os.name == 'nt': import msvcrt
+else: import fcntl
+try: import brotli
+except ImportError: brotli = None
 
 logo = """
     --------------------------------------------------------------------------
@@ -31,55 +56,104 @@ logoCommented = """
 //    |                                                                        |
 //    --------------------------------------------------------------------------
 """
+muted = False
+sessionMuted = False
+profilePath = os.environ.get('AUTUMN_PROFILE')
+profilePhases = [('startup', time.perf_counter())]
+bundlerEdits = None
 
 
 def log(data: str, isOk: bool) -> None:
-    if not '--mute' in sys.argv:
+    if not muted:
         print(f'[autumn][{datetime.datetime.now().strftime("%H:%M:%S")}][{"OK" if isOk else "WARN"}]', data)
 
 def divider(caption: str) -> None:
-    width = os.get_terminal_size().columns
+    if profilePath: profilePhases.append((caption, time.perf_counter()))
+    width = shutil.get_terminal_size().columns
     print(f'\n{caption} {"-" * (width - len(caption) - 1)}')
 
-def table(data: list, horizontalDivider: str = '', verticalDivider: str = '', headDivider: str = '') -> str:
-    width = os.get_terminal_size().columns
-    output = ''
-    for rowIndex, row in enumerate(data):
-        if rowIndex < 2 and headDivider: output += '\n' + headDivider * width
-        else: output += '\n' + horizontalDivider * width
-        for cellIndex, cell in enumerate(row):
-            if cellIndex > 0: output += verticalDivider + ' '
-            output += str(cell) + ' ' * (((width - len(verticalDivider + ' ')) // len(data[0])) - len(verticalDivider + ' ') - len(str(cell)))
-    return output
+@contextlib.contextmanager
+def fileLock(path: str):
+    os.makedirs('./.autumn/locks', exist_ok=True)
+    lockFile = open(f"./.autumn/locks/{os.path.normpath(path).replace(os.sep, '-')}.lock", 'a+')
+    try:
+        if os.name == 'nt':
+            while True:
+                try:
+                    msvcrt.locking(lockFile.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError: pass
+        else: fcntl.flock(lockFile.fileno(), fcntl.LOCK_EX)
+        yield
+    finally:
+        if os.name == 'nt':
+            lockFile.seek(0)
+            msvcrt.locking(lockFile.fileno(), msvcrt.LK_UNLCK, 1)
+        lockFile.close()
+
+def writeAtomic(path: str, content: str) -> None:
+    temporaryPath = f'{path}.{os.getpid()}.tmp'
+    temporaryFile = open(temporaryPath, 'w', encoding='utf-8', newline='')
+    try:
+        temporaryFile.write(content)
+        temporaryFile.flush()
+        os.fsync(temporaryFile.fileno())
+    finally: temporaryFile.close()
+    os.replace(temporaryPath, path)
+
+def writeTable(rows, horizontalDivider: str = '', verticalDivider: str = '', headDivider: str = '', stream=None) -> None:
+    stream = stream or sys.stdout
+    width = shutil.get_terminal_size().columns
+    separator = verticalDivider + ' '
+    cellWidth = None
+    for rowIndex, row in enumerate(rows):
+        if cellWidth is None: cellWidth = ((width - len(separator)) // len(row)) - len(separator)
+        rowDivider = headDivider if rowIndex < 2 and headDivider else horizontalDivider
+        stream.write('\n' + rowDivider * width + '\n' if rowDivider else '\n')
+        stream.write(separator.join(str(cell).ljust(cellWidth) for cell in row).rstrip())
+    stream.write('\n')
 
 def commands() -> None:
     commands = [
         ['COMMAND', 'DESCRIPTION', 'SYNTAX'],
         ['commands', 'lists all available commands.', 'autumn commands'],
-        ['scaffold', 'scaffolds the project structure.', 'autumn scaffold [--mute to mute]'],
+        ['scaffold', 'scaffolds the project structure, --snapshot materializes it offline from the local snapshot', 'autumn scaffold [--snapshot] [--no-editor] [--mute to mute]'],
+        ['snapshot', 'builds (or rebuilds) the local scaffold snapshot including node_modules', 'autumn snapshot [--mute to mute]'],
+
+        ['start:prod', 'starts the application in production mode on a supervised worker pool (ctrl + c to stop, SIGHUP to reload)', 'autumn start:prod [--workers count]'],
+        ['start:dev', 'starts the application in development mode and restarts it on changes (ctrl + c to stop)', 'autumn start:dev'],
 
-        ['start:prod', 'starts the application in production mode (ctrl + c to stop)', 'autumn start:prod'],
-        ['start:dev', 'starts the application in development mode (ctrl + c to stop)', 'autumn start:dev'],
+        ['make:helper', 'creates and links one or more helpers', 'autumn make:helper [name ...] [--manifest file] [--no-editor] [--mute to mute]'],
+        ['make:middleware', 'creates and links one or more middlewares', 'autumn make:middleware [name ...] [--manifest file] [--no-editor] [--mute to mute]'],
+        ['make:model', 'creates and links one or more models', 'autumn make:model [name ...] [--manifest file] [--no-editor] [--mute to mute]'],
+        ['make:route', 'creates and links one or more routes', 'autumn make:route [name ...] [--manifest file] [--no-editor] [--mute to mute]'],
+        ['make:validator', 'creates and links one or more validators, --schema compiles them from a json schema', 'autumn make:validator [name ...] [--manifest file] [--schema file] [--no-editor] [--mute to mute]'],
+        ['make:cache', 'creates and links the responseCache lru middleware with per route ttl, etag/304 handling and request coalescing', 'autumn make:cache [--mute to mute]'],
+        ['make:stats', 'creates and links the routeStats latency histogram middleware', 'autumn make:stats [--mute to mute]'],
 
-        ['make:helper', 'creates and links a helper', 'autumn make:helper [name] [--mute to mute]'],
-        ['make:middleware', 'creates and links a middleware', 'autumn make:middleware [name] [--mute to mute]'],
-        ['make:model', 'creates and links a model', 'autumn make:model [name] [--mute to mute]'],
-        ['make:route', 'creates and links a route', 'autumn make:route [name] [--mute to mute]'],
-        ['make:validator', 'creates and links a validator', 'autumn make:validator [name] [--mute to mute]'],
+        ['delete:helper', 'deletes and unlinks one or more helpers', 'autumn delete:helper [name ...] [--manifest file] [--mute to mute]'],
+        ['delete:middleware', 'deletes and unlinks one or more middlewares', 'autumn delete:middleware [name ...] [--manifest file] [--mute to mute]'],
+        ['delete:model', 'deletes and unlinks one or more models', 'autumn delete:model [name ...] [--manifest file] [--mute to mute]'],
+        ['delete:route', 'deletes and unlinks one or more routes', 'autumn delete:route [name ...] [--manifest file] [--mute to mute]'],
+        ['delete:validator', 'deletes and unlinks one or more validators', 'autumn delete:validator [name ...] [--manifest file] [--mute to mute]'],
 
-        ['delete:helper', 'deletes and unlinks a helper', 'autumn delete:helper [name] [--mute to mute]'],
-        ['delete:middleware', 'deletes and unlinks a middleware', 'autumn delete:middleware [name] [--mute to mute]'],
-        ['delete:model', 'deletes and unlinks a model', 'autumn delete:model [name] [--mute to mute]'],
-        ['delete:route', 'deletes and unlinks a route', 'autumn delete:route [name] [--mute to mute]'],
-        ['delete:validator', 'deletes and unlinks a validator', 'autumn delete:validator [name] [--mute to mute]'],
+        ['list:routes', 'lists all application routes, optionally as json, ndjson or csv', 'autumn list:routes [--json | --ndjson | --csv]'],
+        ['list:unused', 'lists helpers, middlewares, models and validators that are never referenced by project code', 'autumn list:unused'],
+        ['build:routes', 'generates a radix tree route dispatcher and reports duplicate and shadowed routes', 'autumn build:routes [--mute to mute]'],
+        ['build:bundlers', 'regenerates the bundlers with eager requires or lazy accessors, --lazy and --eager also set the mode in package.json', 'autumn build:bundlers [--lazy | --eager] [--mute to mute]'],
+        ['build:validators', 'recompiles the validators generated from json schemas whose schema changed', 'autumn build:validators [--mute to mute]'],
+        ['build:static', 'fingerprints and precompresses static assets into build/static', 'autumn build:static [--mute to mute]'],
+        ['stats', 'shows request counts, rps and latency percentiles recorded by the routeStats middleware', 'autumn stats [--all]'],
+        ['bench', 'load tests every GET route and reports rps and latency percentiles', 'autumn bench [--running] [--filter glob] [--param name=value] [--concurrency 32] [--duration 5] [--save file] [--compare file]'],
 
-        ['list:routes', 'lists all application routes', 'autumn list:routes'],
+        ['shell', 'starts an interactive session that runs many commands in one process (exit to quit)', 'autumn shell [--mute to mute]'],
+        ['run', 'runs the commands of a script (one per line, - for stdin) in one process', 'autumn run [script] [--mute to mute]'],
     ]      
 
     print(logo)
-    print(table(commands, '-', '|', '='))
+    writeTable(commands, '-', '|', '=')
 
-def scaffold() -> None:
+def scaffoldProject() -> None:
     divider('creating folders')
     baseFolders = ['helper', 'middlewares', 'models', 'routes', 'static', 'validators', 'views']
     for baseFolder in baseFolders:
@@ -91,56 +165,132 @@ def scaffold() -> None:
     divider('creating bundler')
     bundleFolders = ['helper', 'middlewares', 'models', 'validators']
     for bundleFolder in bundleFolders:
-        if os.path.isfile(f'./{bundleFolder}/index.js'): log(f'skipping [{bundleFolder}] bundler as it already exists', False)
-        else:
-            bundler = open(f'./{bundleFolder}/index.js', 'w')
-            bundler.write(logoCommented + '\n// this bundler is automatically managed by autumn, type autumn:commands to list all available commands')
-            bundler.close()
-            log(f'[{bundleFolder}] bundler created', True)
+        with fileLock(f'./{bundleFolder}/index.js'):
+            if os.path.isfile(f'./{bundleFolder}/index.js'): log(f'skipping [{bundleFolder}] bundler as it already exists', False)
+            else:
+                writeAtomic(f'./{bundleFolder}/index.js', logoCommented + '\n// this bundler is automatically managed by autumn, type autumn:commands to list all available commands')
+                log(f'[{bundleFolder}] bundler created', True)
 
     divider('creating route autoloader')
-    if os.path.isfile('./routes/index.js'): log('skipping the route autoloader as it already exists', False)
-    else:
-        autoloader = open('./routes/index.js', 'w')
-        autoloader.write(logoCommented + """\n// this autoloader is automatically managed by autumn, type autumn:commands to list all available commands
+    with fileLock('./routes/index.js'):
+        if os.path.isfile('./routes/index.js'): log('skipping the route autoloader as it already exists', False)
+        else:
+            writeAtomic('./routes/index.js', logoCommented + """\n// this autoloader is automatically managed by autumn, type autumn:commands to list all available commands
 const express = require('express')
 const router = express.Router()
 
 module.exports = router""")
-        autoloader.close()
-        log(f'route autoloader created', True)
+            log(f'route autoloader created', True)
 
     divider('creating cleanLogger helper')
     if os.path.isfile('./helper/cleanLogger.js'): log('skipping the cleanLogger helper as it already exists', False)
     else: 
         cleanLogger = open('./helper/cleanLogger.js', 'w')
-        cleanLogger.write("""module.exports = function (log, isOk) {
-	const date = new Date()
-	let hours = date.getHours()
-	let minutes = date.getMinutes()
-	let seconds = date.getSeconds()
-	if (hours < 10) hours = `0${hours}`
-	if (minutes < 10) minutes = `0${minutes}`
-	if (seconds < 10) seconds = `0${seconds}`
-	const state = isOk ? 'OK' : 'WARN'
-	console.log(`[fall][${hours}:${minutes}:${seconds}][${state}] ${log}`)
+        cleanLogger.write("""// buffered logger: cleanLogger(log, isOk) queues a line in a ring buffer that is written in batches off the request path
+// LOG_FILE appends to a file instead of stdout, LOG_FORMAT=json writes json lines, LOG_BUFFER sets the ring buffer size
+const fs = require('fs')
+
+const capacity = Number(process.env.LOG_BUFFER || 4096)
+const json = process.env.LOG_FORMAT === 'json'
+const output = process.env.LOG_FILE ? fs.createWriteStream(process.env.LOG_FILE, { flags: 'a' }) : process.stdout
+const ring = new Array(capacity)
+let head = 0
+let size = 0
+let dropped = 0
+let droppedTotal = 0
+let scheduled = false
+let blocked = false
+
+let secondStart = 0
+let clock = ''
+let isoClock = ''
+
+function tick(now) {
+	secondStart = now - (now % 1000)
+	const date = new Date(secondStart)
+	clock = date.toTimeString().slice(0, 8)
+	isoClock = date.toISOString()
 }
+
+function format(log, isOk) {
+	const now = Date.now()
+	if (now - secondStart >= 1000 || now < secondStart) tick(now)
+	if (!json) return `[fall][${clock}][${isOk ? 'OK' : 'WARN'}] ${log}\\n`
+	if (log !== null && typeof log === 'object') return JSON.stringify({ time: isoClock, state: isOk ? 'OK' : 'WARN', ...log }) + '\\n'
+	return JSON.stringify({ time: isoClock, state: isOk ? 'OK' : 'WARN', message: String(log) }) + '\\n'
+}
+
+function drain() {
+	let batch = dropped ? format(`${dropped} log lines dropped as the log buffer was full`, false) : ''
+	dropped = 0
+	while (size > 0) {
+		batch += ring[head]
+		ring[head] = undefined
+		head = (head + 1) % capacity
+		size--
+	}
+	return batch
+}
+
+function flush() {
+	scheduled = false
+	if (blocked || (size === 0 && dropped === 0)) return
+	if (!output.write(drain())) {
+		blocked = true
+		output.once('drain', () => {
+			blocked = false
+			schedule()
+		})
+	}
+}
+
+function schedule() {
+	if (scheduled) return
+	scheduled = true
+	setImmediate(flush)
+}
+
+process.on('exit', () => {
+	const batch = drain()
+	if (!batch) return
+	if (process.env.LOG_FILE) fs.appendFileSync(process.env.LOG_FILE, batch)
+	else fs.writeSync(1, batch)
+})
+
+module.exports = function cleanLogger(log, isOk) {
+	if (size === capacity) {
+		dropped++
+		droppedTotal++
+		return
+	}
+	ring[(head + size) % capacity] = format(log, isOk)
+	size++
+	schedule()
+}
+
+module.exports.flush = flush
+module.exports.stats = () => ({ buffered: size, dropped: droppedTotal })
         """)
         cleanLogger.close()
-        helperBundler = open('./helper/index.js', 'a')
-        helperBundler.write("\nmodule.exports.cleanLogger = require('./cleanLogger')")
-        helperBundler.close()
+        updateBundler('helper', added=['cleanLogger'])
         log('cleanLogger helper created', True)
 
+    divider('creating routeStats middleware')
+    if os.path.isfile('./middlewares/routeStats.js'): log('skipping the routeStats middleware as it already exists', False)
+    else:
+        writeRouteStatsMiddleware()
+        log('routeStats middleware created', True)
+
+    divider('creating staticAssets middleware')
+    if os.path.isfile('./middlewares/staticAssets.js'): log('skipping the staticAssets middleware as it already exists', False)
+    else:
+        writeStaticAssetsMiddleware()
+        log('staticAssets middleware created', True)
+
     divider('creating config files')
     if os.path.isfile('./.env'): log('skipping .env as it already exists', False)
     else:
-        env = open('./.env', 'w')
-        env.write(f"""APP_ROOT={os.getcwd()}
-PROT=http
-HOST=0.0.0.0
-PORT=5000
-        """)
+        writeEnv()
         log('.env created', True)
 
     if os.path.isfile('./.env.example'): log('skipping .env.example as it already exists', False)
@@ -156,6 +306,8 @@ PORT=[the port the application runs on]
     else:
         gitignore = open('./.gitignore', 'w')
         gitignore.write("""/node_modules
+/.autumn
+/build
 .env
 .todo
         """)
@@ -199,19 +351,30 @@ PORT=[the port the application runs on]
 const express = require('express')
 
 const helper = require('./helper')
+const middlewares = require('./middlewares')
 const routes = require('./routes')
 
 const app = express()
 
-app.use('/static', express.static('./static'))
+app.use('/static', middlewares.staticAssets, express.static('./static'))
+app.use(middlewares.routeStats)
 app.use(routes)
 
 const prot = process.env.PROT
 const host = process.env.HOST
 const port = process.env.PORT
-app.listen(port, host, () => {
+const listenFd = process.env.AUTUMN_LISTEN_FD
+const readyFd = process.env.AUTUMN_READY_FD
+const server = app.listen(listenFd ? { fd: Number(listenFd) } : { port, host }, () => {
 	helper.cleanLogger(`application listening on [${prot}://${host}:${port}]`, true)
-    helper.cleanLogger(`application is running in [${process.env.NODE_ENV}] mode`, true)
+	helper.cleanLogger(`application is running in [${process.env.NODE_ENV}] mode`, true)
+	if (readyFd) require('fs').writeSync(Number(readyFd), 'ready\\n')
+})
+
+process.on('SIGTERM', () => {
+	server.close(() => process.exit(0))
+	if (server.closeIdleConnections) server.closeIdleConnections()
+	setTimeout(() => process.exit(0), 10000).unref()
 })
         """)
         log('app.js created', True)
@@ -219,14 +382,7 @@ app.listen(port, host, () => {
     divider('creating package.json')
     if os.path.isfile('./package.json'): log('skipping package.json as it already exists.', False)
     else:
-        os.system('npm init -y')
-        package = open('./package.json')
-        packageFromJson = json.load(package)
-        packageFromJson['scripts'] = {'start:prod': 'cross-env NODE_ENV=production node app', 'start:dev': 'cross-env NODE_ENV=development nodemon app'}
-        package.close()
-        package = open('./package.json', 'w')
-        json.dump(packageFromJson, package)
-        package.close()
+        writePackageJson()
         log('package.json created', True)
 
     divider('installing dependencies')
@@ -234,227 +390,2052 @@ app.listen(port, host, () => {
     else:
         os.system('npm install --save-dev nodemon cross-env')
         os.system('npm install --save express dotenv')
-    
-    divider('opening app.js with vscode')
-    os.system('code app.js')
 
-def makeHelper() -> None:
-    if len(sys.argv) < 3: log('missing name of helper, use autumn make:helper [name] or type autumn commands to list all available commands', False)
-    else:
-        helperName = sys.argv[2].replace('.js', '')
-        if os.path.isfile(f'./helper/{helperName}.js'): log(f'skipping [{helperName}] helper as it already exists', False)       
-        else:  
-            helperFile = open(f'./helper/{helperName}.js', 'w')
-            helperFile.write("""module.exports = function() {}""")
-            helperFile.close()
-            helperBundler = open('./helper/index.js', 'a')
-            helperBundler.write(f"\nmodule.exports.{helperName} = require('./{helperName}')")
-            helperBundler.close()
-            os.system(f'code ./helper/{helperName}.js')
-            log(f'[{helperName}] helper created', True)
-
-def makeMiddleware() -> None:
-    if len(sys.argv) < 3: log('missing name of middleware, use autumn make:middleware [name] or type autumn commands to list all available commands', False)
-    else:
-        middlewareName = sys.argv[2].replace('.js', '')
-        if os.path.isfile(f'./middlewares/{middlewareName}.js'): log(f'skipping [{middlewareName}] middleware as it already exists', False)       
-        else:  
-            middlewareFile = open(f'./middlewares/{middlewareName}.js', 'w')
-            middlewareFile.write("""module.exports = function(req, res, next) {}""")
-            middlewareFile.close()
-            middlewareBundler = open('./middlewares/index.js', 'a')
-            middlewareBundler.write(f"\nmodule.exports.{middlewareName} = require('./{middlewareName}')")
-            middlewareBundler.close()
-            os.system(f'code ./middlewares/{middlewareName}.js')
-            log(f'[{middlewareName}] middleware created', True)
-
-def makeModel() -> None:
-    if len(sys.argv) < 3: log('missing name of model, use autumn make:model [name] or type autumn commands to list all available commands', False)
-    else:
-        modelName = sys.argv[2].replace('.js', '')
-        if os.path.isfile(f'./models/{modelName}.js'): log(f'skipping [{modelName}] model as it already exists', False)       
-        else:  
-            modelFile = open(f'./models/{modelName}.js', 'w')
-            modelFile.write("""module.exports = function() {}""")
-            modelFile.close()
-            modelBundler = open('./models/index.js', 'a')
-            modelBundler.write(f"\nmodule.exports.{modelName} = require('./{modelName}')")
-            modelBundler.close()
-            os.system(f'code ./models/{modelName}.js')
-            log(f'[{modelName}] model created', True)
-
-def makeRoute() -> None:
-    if len(sys.argv) < 3: log('missing name of route, use autumn make:route [name] or type autumn commands to list all available commands', False)
-    else:
-        routeName = sys.argv[2].replace('.js', '')
-        if os.path.isfile(f'./routes/{routeName}.js'): log(f'skipping [{routeName}] route as it already exists', False)       
-        else:  
-            routeFile = open(f'./routes/{routeName}.js', 'w')
-            routeFile.write("""const express = require('express')
+def writeEnv() -> None:
+    env = open('./.env', 'w')
+    env.write(f"""APP_ROOT={os.getcwd()}
+PROT=http
+HOST=0.0.0.0
+PORT=5000
+        """)
+    env.close()
+
+def packageName() -> str:
+    return ''.join(char if char.isalnum() or char in '-._' else '-' for char in os.path.basename(os.getcwd()).lower()).lstrip('._') or 'app'
+
+def writePackageJson() -> None:
+    package = open('./package.json', 'w')
+    json.dump({
+        'name': packageName(),
+        'version': '1.0.0',
+        'description': '',
+        'main': 'app.js',
+        'scripts': {'start:prod': 'cross-env NODE_ENV=production node app', 'start:dev': 'cross-env NODE_ENV=development nodemon app'},
+        'keywords': [],
+        'author': '',
+        'license': 'ISC',
+    }, package, indent=2)
+    package.close()
+
+snapshotPath = os.environ.get('AUTUMN_SNAPSHOT', os.path.join(os.path.expanduser('~'), '.autumn', 'snapshot'))
+snapshotMetaName = '.autumn-snapshot.json'
+snapshotEntries = ['helper', 'middlewares', 'models', 'routes', 'static', 'validators', 'views', 'app.js', 'package.json', 'node_modules']
+
+def autumnHash() -> str:
+    autumnFile = open(os.path.abspath(__file__), 'rb')
+    autumnHash = hashlib.sha256(autumnFile.read()).hexdigest()
+    autumnFile.close()
+    return autumnHash
+
+def snapshotIsCurrent() -> bool:
+    if not os.path.isfile(os.path.join(snapshotPath, snapshotMetaName)): return False
+    snapshotMeta = open(os.path.join(snapshotPath, snapshotMetaName), 'r', encoding='utf-8')
+    snapshotMetaFromJson = json.load(snapshotMeta)
+    snapshotMeta.close()
+    return snapshotMetaFromJson.get('autumn') == autumnHash()
+
+def buildSnapshot() -> None:
+    global bundlerEdits
+    buildPath = f'{snapshotPath}.{os.getpid()}.build'
+    os.makedirs(buildPath)
+    workingDirectory = os.getcwd()
+    os.chdir(buildPath)
+    # inside autumn run and shell bundler edits are queued, the snapshot must get its own links before leaving its folder
+    sessionEdits, bundlerEdits = bundlerEdits, None
+    try:
+        scaffoldProject()
+        if not os.path.isdir('./node_modules') or not os.path.isfile('./package-lock.json'): raise RuntimeError('npm install did not produce node_modules and package-lock.json')
+        os.remove('./.env')
+        shutil.rmtree('./.autumn', ignore_errors=True)
+        snapshotMeta = open(snapshotMetaName, 'w', encoding='utf-8')
+        json.dump({'autumn': autumnHash(), 'created': datetime.datetime.now().isoformat()}, snapshotMeta)
+        snapshotMeta.close()
+    except BaseException:
+        os.chdir(workingDirectory)
+        shutil.rmtree(buildPath, ignore_errors=True)
+        raise
+    finally: bundlerEdits = sessionEdits
+    os.chdir(workingDirectory)
+    oldPath = f'{snapshotPath}.{os.getpid()}.old'
+    if os.path.isdir(snapshotPath): os.rename(snapshotPath, oldPath)
+    os.rename(buildPath, snapshotPath)
+    shutil.rmtree(oldPath, ignore_errors=True)
+
+def snapshot() -> None:
+    divider('building snapshot')
+    buildSnapshot()
+    log(f'snapshot created in [{snapshotPath}]', True)
+
+def materializeFile(entry: tuple) -> None:
+    source, target, link = entry
+    if os.path.islink(source): os.symlink(os.readlink(source), target)
+    elif link:
+        try: os.link(source, target)
+        except OSError: shutil.copy2(source, target)
+    else: shutil.copy2(source, target)
+
+def scaffoldFromSnapshot() -> None:
+    existingEntries = [entry for entry in snapshotEntries if os.path.exists(entry)]
+    if existingEntries:
+        log(f'falling back to a regular scaffold as [{", ".join(existingEntries)}] already exist', False)
+        scaffoldProject()
+        return
+    if not snapshotIsCurrent():
+        divider('building snapshot')
+        buildSnapshot()
+
+    divider('materializing snapshot')
+    folders = []
+    files = []
+    for entry in sorted(os.listdir(snapshotPath)):
+        if entry == snapshotMetaName or os.path.exists(entry): continue
+        source = os.path.join(snapshotPath, entry)
+        if os.path.isdir(source) and not os.path.islink(source):
+            for root, folderNames, fileNames in os.walk(source):
+                target = os.path.relpath(root, snapshotPath)
+                folders.append(target)
+                for folderName in folderNames:
+                    if os.path.islink(os.path.join(root, folderName)): files.append((os.path.join(root, folderName), os.path.join(target, folderName), False))
+                for fileName in fileNames: files.append((os.path.join(root, fileName), os.path.join(target, fileName), entry == 'node_modules'))
+        else: files.append((source, entry, False))
+        log(f'[{entry}] created', True)
+    for folder in folders: os.makedirs(folder, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool: list(pool.map(materializeFile, files, chunksize=64))
+
+    writeEnv()
+    package = open('./package.json', 'r', encoding='utf-8')
+    packageFromJson = json.load(package)
+    package.close()
+    packageFromJson['name'] = packageName()
+    package = open('./package.json', 'w')
+    json.dump(packageFromJson, package, indent=2)
+    package.close()
+    log('.env and package.json configured for this project', True)
+
+def scaffold() -> None:
+    if '--snapshot' in sys.argv: scaffoldFromSnapshot()
+    else: scaffoldProject()
+
+    if not '--no-editor' in sys.argv:
+        divider('opening app.js with vscode')
+        os.system('code app.js')
+
+artifacts = {
+    'helper': {'folder': 'helper', 'template': 'module.exports = function() {}'},
+    'middleware': {'folder': 'middlewares', 'template': 'module.exports = function(req, res, next) {}'},
+    'model': {'folder': 'models', 'template': 'module.exports = function() {}'},
+    'route': {'folder': 'routes', 'template': """const express = require('express')
 
 const router = express.Router()
 
-module.exports = router""")
-            routeFile.close()
-            routeAutoloader = open('./routes/index.js')
-            routeAutoloaderLines = routeAutoloader.readlines()
-            routeAutoloader.close()
-            routeAutoloader = open('./routes/index.js', 'w')
-            for routeAutoloaderLine in routeAutoloaderLines[:-1]:
-                routeAutoloader.write(routeAutoloaderLine)
-            routeAutoloader.write(f"router.use(require('./{routeName}'))\n")
-            routeAutoloader.write(routeAutoloaderLines[-1])
-            routeAutoloader.close()
-            os.system(f'code ./routes/{routeName}.js')
-            log(f'[{routeName}] route created', True)
-
-def makeValidator() -> None:
-    if len(sys.argv) < 3: log('missing name of validator, use autumn make:validator [name] or type autumn commands to list all available commands', False)
-    else:
-        validatorName = sys.argv[2].replace('.js', '')
-        if os.path.isfile(f'./validators/{validatorName}.js'): log(f'skipping [{validatorName}] validator as it already exists', False)       
-        else:  
-            modelFile = open(f'./validators/{validatorName}.js', 'w')
-            modelFile.write("""module.exports = function() {}""")
-            modelFile.close()
-            modelBundler = open('./validators/index.js', 'a')
-            modelBundler.write(f"\nmodule.exports.{validatorName} = require('./{validatorName}')")
-            modelBundler.close()
-            os.system(f'code ./validators/{validatorName}.js')
-            log(f'[{validatorName}] validator created', True)
-
-def deleteHelper() -> None:
-    if len(sys.argv) < 3: log('missing name of helper, use autumn delete:helper [name] or type autumn commands to list all available commands', False)
-    else:
-        helperName = sys.argv[2].replace('.js', '')
-        if not os.path.isfile(f'./helper/{helperName}.js'): log(f'skipping [{helperName}] helper as it does not exist', False)
-        else:
-            os.remove(f'./helper/{helperName}.js')
-            helperBundler = open('./helper/index.js', 'r')
-            helperBundlerLines = helperBundler.readlines()
-            helperBundler.close()
-            helperBundler = open('./helper/index.js', 'w')
-            helperBundlerLines = [helperBundlerLine for helperBundlerLine in helperBundlerLines if f"module.exports.{helperName} = require('./{helperName}')" not in helperBundlerLine]
-            for helperBundlerLine in helperBundlerLines:
-                helperBundler.write(helperBundlerLine)
-            helperBundler.close()
-            log(f'[{helperName}] helper deleted', True)
-
-def deleteMiddleware() -> None:
-    if len(sys.argv) < 3: log('missing name of middleware, use autumn delete:middleware [name] or type autumn commands to list all available commands', False)
-    else:
-        middlewareName = sys.argv[2].replace('.js', '')
-        if not os.path.isfile(f'./middlewares/{middlewareName}.js'): log(f'skipping [{middlewareName}] middlewares as it does not exist', False)
+module.exports = router"""},
+    'validator': {'folder': 'validators', 'template': 'module.exports = function() {}'},
+}
+
+def commandNames() -> list:
+    names = []
+    arguments = sys.argv[2:]
+    index = 0
+    while index < len(arguments):
+        if arguments[index] == '--manifest' and index + 1 < len(arguments):
+            manifest = open(arguments[index + 1], 'r', encoding='utf-8')
+            names += [line.strip() for line in manifest if line.strip() and not line.strip().startswith('#')]
+            manifest.close()
+            index += 2
+        elif arguments[index] == '--schema': index += 2
         else:
-            os.remove(f'./middlewares/{middlewareName}.js')
-            middlewareBundler = open('./middlewares/index.js', 'r')
-            middlewareBundlerLines = middlewareBundler.readlines()
-            middlewareBundler.close()
-            middlewareBundler = open('./middlewares/index.js', 'w')
-            middlewareBundlerLines = [middlewareBundlerLine for middlewareBundlerLine in middlewareBundlerLines if f"module.exports.{middlewareName} = require('./{middlewareName}')" not in middlewareBundlerLine]
-            for middlewareBundlerLine in middlewareBundlerLines:
-                middlewareBundler.write(middlewareBundlerLine)
-            middlewareBundler.close()
-            log(f'[{middlewareName}] middlewares deleted', True)
-
-def deleteModel() -> None:
-    if len(sys.argv) < 3: log('missing name of model, use autumn delete:model [name] or type autumn commands to list all available commands', False)
-    else:
-        modelName = sys.argv[2].replace('.js', '')
-        if not os.path.isfile(f'./models/{modelName}.js'): log(f'skipping [{modelName}] models as it does not exist', False)
+            if not arguments[index].startswith('--'): names.append(arguments[index])
+            index += 1
+    return list(dict.fromkeys(name.replace('.js', '') for name in names))
+
+bundlerKinds = ['helper', 'middleware', 'model', 'validator']
+
+def bundlerMode() -> str:
+    if not os.path.isfile('./package.json'): return 'eager'
+    package = open('./package.json', 'r', encoding='utf-8')
+    try: mode = json.load(package).get('autumn', {}).get('bundler', 'eager')
+    except (ValueError, AttributeError): mode = 'eager'
+    package.close()
+    return mode if mode in ['eager', 'lazy'] else 'eager'
+
+def bundlerLine(kind: str, name: str, lazy: bool = False) -> str:
+    if kind == 'route': return f"router.use(require('./{name}'))"
+    if lazy: return f"Object.defineProperty(module.exports, '{name}', {{ configurable: true, enumerable: true, get() {{ return Object.defineProperty(this, '{name}', {{ enumerable: true, value: require('./{name}') }}).{name} }} }})"
+    return f"module.exports.{name} = require('./{name}')"
+
+def bundlerForms(kind: str, name: str) -> set:
+    return {bundlerLine(kind, name), bundlerLine(kind, name, True)}
+
+def bundlerEntry(kind: str, line: str) -> str:
+    line = line.strip()
+    if not "require('./" in line: return None
+    name = line.split("require('./", 1)[1].split("'", 1)[0]
+    return name if line in bundlerForms(kind, name) else None
+
+def editBundlerLines(kind: str, lines: list, added: list, removed: list, lazy: bool = False) -> list:
+    existingLines = {line.strip() for line in lines}
+    added = [name for name in added if existingLines.isdisjoint(bundlerForms(kind, name))]
+    if removed:
+        removedLines = set().union(*(bundlerForms(kind, name) for name in removed))
+        lines = [line for line in lines if line.strip() not in removedLines]
+    if added and kind == 'route':
+        exportIndex = next((lineIndex for lineIndex in range(len(lines) - 1, -1, -1) if lines[lineIndex].startswith('module.exports')), len(lines))
+        lines[exportIndex:exportIndex] = [bundlerLine(kind, name) for name in added]
+    elif added: lines += [bundlerLine(kind, name, lazy) for name in added]
+    return lines
+
+def applyBundlerEdits(kind: str, edits: list) -> None:
+    bundlerPath = f"./{artifacts[kind]['folder']}/index.js"
+    lazy = kind != 'route' and bundlerMode() == 'lazy'
+    with fileLock(bundlerPath):
+        bundler = open(bundlerPath, 'r', encoding='utf-8', newline='')
+        content = bundler.read()
+        bundler.close()
+        lines = content.split('\n')
+        for added, removed in edits: lines = editBundlerLines(kind, lines, added, removed, lazy)
+        if '\n'.join(lines) != content: writeAtomic(bundlerPath, '\n'.join(lines))
+
+def updateBundler(kind: str, added: list = [], removed: list = []) -> None:
+    if bundlerEdits is None: applyBundlerEdits(kind, [(added, removed)])
+    else: bundlerEdits.setdefault(kind, []).append((list(added), list(removed)))
+
+def flushBundlers() -> None:
+    global bundlerEdits
+    if not bundlerEdits: return
+    edits, bundlerEdits = bundlerEdits, {}
+    for kind in edits: applyBundlerEdits(kind, edits[kind])
+
+def setBundlerMode(mode: str) -> None:
+    package = open('./package.json', 'r', encoding='utf-8')
+    packageFromJson = json.load(package)
+    package.close()
+    packageFromJson.setdefault('autumn', {})['bundler'] = mode
+    writeAtomic('./package.json', json.dumps(packageFromJson, indent=2))
+    log(f'bundler mode set to [{mode}] in package.json', True)
+
+def buildBundlers() -> bool:
+    if '--lazy' in sys.argv or '--eager' in sys.argv:
+        if not os.path.isfile('./package.json'):
+            log('missing package.json, use autumn scaffold or type autumn commands to list all available commands', False)
+            return False
+        setBundlerMode('lazy' if '--lazy' in sys.argv else 'eager')
+    lazy = bundlerMode() == 'lazy'
+
+    divider(f"regenerating {'lazy' if lazy else 'eager'} bundlers")
+    for kind in bundlerKinds:
+        bundlerPath = f"./{artifacts[kind]['folder']}/index.js"
+        if not os.path.isfile(bundlerPath):
+            log(f'skipping [{bundlerPath}] as the bundler does not exist', False)
+            continue
+        with fileLock(bundlerPath):
+            bundler = open(bundlerPath, 'r', encoding='utf-8', newline='')
+            content = bundler.read()
+            bundler.close()
+            lines = []
+            for line in content.split('\n'):
+                name = bundlerEntry(kind, line)
+                lines.append(line if name is None else bundlerLine(kind, name, lazy))
+            if '\n'.join(lines) != content:
+                writeAtomic(bundlerPath, '\n'.join(lines))
+                log(f'[{os.path.normpath(bundlerPath)}] bundler regenerated', True)
+            else: log(f'skipping [{os.path.normpath(bundlerPath)}] bundler as it is already {"lazy" if lazy else "eager"}', False)
+    return True
+
+def projectSourceFiles() -> list:
+    sourceFiles = []
+    for folder, folders, fileNames in os.walk('.'):
+        folders[:] = [name for name in folders if not name in ['node_modules', '.git', '.autumn', 'build']]
+        sourceFiles += [os.path.normpath(os.path.join(folder, fileName)) for fileName in fileNames if fileName.endswith('.js')]
+    return sorted(sourceFiles)
+
+def listUnused() -> None:
+    entries = {}
+    for kind in bundlerKinds:
+        bundlerPath = f"./{artifacts[kind]['folder']}/index.js"
+        if not os.path.isfile(bundlerPath): continue
+        bundler = open(bundlerPath, 'r', encoding='utf-8')
+        for line in bundler:
+            name = bundlerEntry(kind, line)
+            if name is not None: entries[(kind, name)] = os.path.normpath(f"./{artifacts[kind]['folder']}/{name}.js")
+        bundler.close()
+    bundlerPaths = {os.path.normpath(f"./{artifacts[kind]['folder']}/index.js") for kind in bundlerKinds}
+
+    references = {}
+    for sourcePath in projectSourceFiles():
+        if sourcePath in bundlerPaths: continue
+        source = open(sourcePath, 'r', encoding='utf-8', errors='replace')
+        tokens = tokenize(source.read())
+        source.close()
+        for name in {token[1] if token[0] == 'name' else token[1][1:-1] for token in tokens if token[0] in ['name', 'string']}:
+            references.setdefault(name, []).append(sourcePath)
+
+    unused = [[kind, name, path] for (kind, name), path in entries.items() if not any(referencePath != path for referencePath in references.get(name, []))]
+    if not unused:
+        log(f'all {len(entries)} bundler entries are referenced', True)
+        return
+    writeTable([['KIND', 'NAME', 'FILE']] + unused, '-', '|', '=')
+    log(f'{len(unused)} of {len(entries)} bundler entries are never referenced', False)
+
+def makeArtifacts(kind: str) -> bool:
+    folder = artifacts[kind]['folder']
+    names = commandNames()
+    if not names:
+        log(f'missing name of {kind}, use autumn make:{kind} [name ...] or type autumn commands to list all available commands', False)
+        return False
+    created = []
+    for name in names:
+        try: artifactFile = open(f'./{folder}/{name}.js', 'x')
+        except FileExistsError:
+            log(f'skipping [{name}] {kind} as it already exists', False)
+            continue
+        artifactFile.write(artifacts[kind]['template'])
+        artifactFile.close()
+        created.append(name)
+    if not created: return True
+    updateBundler(kind, added=created)
+    if not '--no-editor' in sys.argv: os.system('code ' + ' '.join(f'./{folder}/{name}.js' for name in created))
+    for name in created: log(f'[{name}] {kind} created', True)
+    return True
+
+def deleteArtifacts(kind: str) -> bool:
+    folder = artifacts[kind]['folder']
+    names = commandNames()
+    if not names:
+        log(f'missing name of {kind}, use autumn delete:{kind} [name ...] or type autumn commands to list all available commands', False)
+        return False
+    deleted = []
+    for name in names:
+        try: os.remove(f'./{folder}/{name}.js')
+        except FileNotFoundError:
+            log(f'skipping [{name}] {kind} as it does not exist', False)
+            continue
+        deleted.append(name)
+    if not deleted: return True
+    updateBundler(kind, removed=deleted)
+    for name in deleted: log(f'[{name}] {kind} deleted', True)
+    return True
+
+def makeHelper() -> bool: return makeArtifacts('helper')
+def makeMiddleware() -> bool: return makeArtifacts('middleware')
+def makeModel() -> bool: return makeArtifacts('model')
+def makeRoute() -> bool: return makeArtifacts('route')
+def makeValidator() -> bool:
+    if optionValue('--schema') is None: return makeArtifacts('validator')
+    return makeSchemaValidators(optionValue('--schema'))
+
+def deleteHelper() -> bool: return deleteArtifacts('helper')
+def deleteMiddleware() -> bool: return deleteArtifacts('middleware')
+def deleteModel() -> bool: return deleteArtifacts('model')
+def deleteRoute() -> bool: return deleteArtifacts('route')
+def deleteValidator() -> bool: return deleteArtifacts('validator')
+
+validatorCompilerVersion = 3
+validatorHeader = '// generated by autumn from ['
+schemaAnnotations = ['$schema', '$id', '$comment', 'title', 'description', 'default', 'examples', 'definitions', '$defs', 'readOnly', 'writeOnly', 'deprecated', 'contentMediaType', 'contentEncoding']
+schemaKeywords = ['$ref', 'type', 'enum', 'const', 'allOf', 'anyOf', 'oneOf', 'not', 'minLength', 'maxLength', 'pattern', 'format', 'minimum', 'maximum', 'exclusiveMinimum', 'exclusiveMaximum', 'multipleOf', 'required', 'properties', 'additionalProperties', 'minProperties', 'maxProperties', 'items', 'additionalItems', 'minItems', 'maxItems', 'uniqueItems']
+schemaFormats = {
+    'date': r'^\d{4}-\d{2}-\d{2}$',
+    'time': r'^\d{2}:\d{2}:\d{2}(\.\d+)?([Zz]|[+-]\d{2}:\d{2})?$',
+    'date-time': r'^\d{4}-\d{2}-\d{2}[Tt ]\d{2}:\d{2}:\d{2}(\.\d+)?([Zz]|[+-]\d{2}:\d{2})$',
+    'email': r'^[^\s@]+@[^\s@]+\.[^\s@]+$',
+    'uuid': r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$',
+    'uri': r'^[a-zA-Z][a-zA-Z0-9+.-]*:[^\s]*$',
+    'ipv4': r'^((25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)\.){3}(25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)$',
+}
+schemaTypeChecks = {
+    'string': "typeof {0} === 'string'",
+    'number': "typeof {0} === 'number'",
+    'integer': 'Number.isInteger({0})',
+    'boolean': "typeof {0} === 'boolean'",
+    'null': '{0} === null',
+    'array': 'Array.isArray({0})',
+    'object': "typeof {0} === 'object' && {0} !== null && !Array.isArray({0})",
+}
+schemaTypeFailures = {
+    'string': "typeof {0} !== 'string'",
+    'number': "typeof {0} !== 'number'",
+    'integer': '!Number.isInteger({0})',
+    'boolean': "typeof {0} !== 'boolean'",
+    'null': '{0} !== null',
+    'array': '!Array.isArray({0})',
+    'object': "typeof {0} !== 'object' || {0} === null || Array.isArray({0})",
+}
+objectPrototypeNames = ['constructor', 'hasOwnProperty', 'isPrototypeOf', 'propertyIsEnumerable', 'toLocaleString', 'toString', 'valueOf', '__proto__', '__defineGetter__', '__defineSetter__', '__lookupGetter__', '__lookupSetter__']
+validatorHelpers = {
+    'codePoints': """function codePoints(string) {
+	let count = 0
+	for (let index = 0; index < string.length; index++) {
+		const code = string.charCodeAt(index)
+		if (code < 0xdc00 || code > 0xdfff) count++
+	}
+	return count
+}""",
+    'isMultipleOf': """// binary floating point makes 0.07 / 0.01 come out as 7.000000000000001, so the quotient is compared with a tolerance
+function isMultipleOf(value, divisor) {
+	const quotient = value / divisor
+	return Math.abs(quotient - Math.round(quotient)) <= 1e-9 * Math.max(1, Math.abs(quotient))
+}""",
+    'uniqueItems': """// objects are keyed by their json with sorted keys, json schema treats { a, b } and { b, a } as equal
+function canonical(value) {
+	if (typeof value !== 'object' || value === null) return JSON.stringify(value)
+	if (Array.isArray(value)) return '[' + value.map(canonical).join(',') + ']'
+	let key = '{'
+	for (const name of Object.keys(value).sort()) key += JSON.stringify(name) + ':' + canonical(value[name]) + ','
+	return key + '}'
+}
+
+function uniqueItems(array) {
+	const seen = new Set()
+	for (const item of array) {
+		const key = typeof item === 'object' && item !== null ? canonical(item) : typeof item + ':' + item
+		if (seen.has(key)) return false
+		seen.add(key)
+	}
+	return true
+}""",
+}
+
+def jsString(text: str) -> str:
+    return "'" + json.dumps(text)[1:-1].replace('\\"', '"').replace("'", "\\'") + "'"
+
+def jsValue(value) -> str:
+    if isinstance(value, str): return jsString(value)
+    if isinstance(value, (dict, list)): raise ValueError('enum and const only support strings, numbers, booleans and null')
+    return json.dumps(value)
+
+def jsPath(path: list) -> str:
+    parts = []
+    for isStatic, text in path:
+        if isStatic and parts and parts[-1][0]: parts[-1] = (True, parts[-1][1] + text)
+        else: parts.append((isStatic, text))
+    return ' + '.join(jsString(text) if isStatic else text for isStatic, text in parts) or "''"
+
+def jsProperty(value: str, name: str) -> str:
+    access = f'{value}.{name}' if name.isidentifier() and name.isascii() else f'{value}[{jsString(name)}]'
+    if name in objectPrototypeNames: return f'(Object.prototype.hasOwnProperty.call({value}, {jsString(name)}) ? {access} : undefined)'
+    return access
+
+def schemaVariable(context: dict, prefix: str) -> str:
+    context['counter'] += 1
+    return f"{prefix}{context['counter']}"
+
+def hoistConstant(context: dict, prefix: str, expression: str) -> str:
+    if not expression in context['constants']: context['constants'][expression] = f"{prefix}{len(context['constants'])}"
+    return context['constants'][expression]
+
+def schemaFunction(context: dict, name: str, schema) -> str:
+    context['functions'][name] = None
+    body = compileSchemaNode(schema, 'data', [(False, 'path')], 1, context)
+    context['functions'][name] = f'function {name}(data, path) {{\n' + ''.join(line + '\n' for line in body) + '\treturn null\n}'
+    return name
+
+def subschemaFunction(context: dict, schema) -> str:
+    if not id(schema) in context['subschemas']: context['subschemas'][id(schema)] = schemaFunction(context, f"schema{len(context['subschemas'])}", schema)
+    return context['subschemas'][id(schema)]
+
+def referenceFunction(context: dict, reference: str) -> str:
+    if reference in context['references']: return context['references'][reference]
+    if not reference.startswith('#'): raise ValueError(f'only local $ref values are supported, [{reference}] is not')
+    schema = context['root']
+    for part in [part for part in reference[1:].split('/') if part]:
+        part = part.replace('~1', '/').replace('~0', '~')
+        try: schema = schema[int(part) if isinstance(schema, list) else part]
+        except (KeyError, IndexError, ValueError, TypeError): raise ValueError(f'cannot resolve $ref [{reference}]')
+    name = f"reference{len(context['references'])}"
+    context['references'][reference] = name
+    return schemaFunction(context, name, schema)
+
+def requiredMessage(name: str) -> str:
+    return f"must have required property '{name}'"
+
+def compileSchemaNode(schema, value: str, path: list, indent: int, context: dict) -> list:
+    pad = '\t' * indent
+    fail = lambda message, where=path: f"return {{ path: {jsPath(where)}, message: {jsString(message)} }}"
+    if schema is True or schema == {}: return []
+    if schema is False: return [f'{pad}{fail("must not be present")}']
+    if not isinstance(schema, dict): raise ValueError(f'expected a schema object, found [{json.dumps(schema)}]')
+    unsupported = [keyword for keyword in schema if not keyword in schemaKeywords and not keyword in schemaAnnotations]
+    if unsupported: raise ValueError(f'unsupported keyword [{unsupported[0]}]')
+    lines = []
+
+    if '$ref' in schema:
+        error = schemaVariable(context, 'e')
+        lines += [f"{pad}const {error} = {referenceFunction(context, schema['$ref'])}({value}, {jsPath(path)})", f'{pad}if ({error} !== null) return {error}']
+
+    types = schema.get('type')
+    if isinstance(types, str): types = [types]
+    if types:
+        if any(not schemaType in schemaTypeChecks for schemaType in types): raise ValueError(f"unknown type [{', '.join(types)}]")
+        failure = schemaTypeFailures[types[0]].format(value) if len(types) == 1 else '!(' + ' || '.join(schemaTypeChecks[schemaType].format(value) for schemaType in types) + ')'
+        lines.append(f"{pad}if ({failure}) {fail('must be ' + ' or '.join(types))}")
+
+    if 'enum' in schema:
+        values = [jsValue(item) for item in schema['enum']]
+        if len(values) <= 4: lines.append(f"{pad}if ({' && '.join(f'{value} !== {item}' for item in values)}) {fail('must be equal to one of the allowed values')}")
         else:
-            os.remove(f'./models/{modelName}.js')
-            modelBundler = open('./models/index.js', 'r')
-            modelBundlerLines = modelBundler.readlines()
-            modelBundler.close()
-            modelBundler = open('./models/index.js', 'w')
-            modelBundlerLines = [modelBundlerLine for modelBundlerLine in modelBundlerLines if f"module.exports.{modelName} = require('./{modelName}')" not in modelBundlerLine]
-            for modelBundlerLine in modelBundlerLines:
-                modelBundler.write(modelBundlerLine)
-            modelBundler.close()
-            log(f'[{modelName}] models deleted', True)
-
-def deleteRoute() -> None:
-    if len(sys.argv) < 3: log('missing name of route, use autumn delete:route [name] or type autumn commands to list all available commands', False)
-    else:
-        routeName = sys.argv[2].replace('.js', '')
-        if not os.path.isfile(f'./routes/{routeName}.js'): log(f'skipping [{routeName}] routes as it does not exist', False)
+            allowed = hoistConstant(context, 'enum', 'new Set([' + ', '.join(values) + '])')
+            lines.append(f"{pad}if (!{allowed}.has({value})) {fail('must be equal to one of the allowed values')}")
+    if 'const' in schema: lines.append(f"{pad}if ({value} !== {jsValue(schema['const'])}) {fail('must be equal to constant')}")
+
+    def guarded(compatible: list, guard: str, compileGroup) -> None:
+        if types and not set(types) & set(compatible): return
+        if types and set(types) <= set(compatible): lines.extend(compileGroup(pad))
         else:
-            os.remove(f'./routes/{routeName}.js')
-            routeBundler = open('./routes/index.js', 'r')
-            routeBundlerLines = routeBundler.readlines()
-            routeBundler.close()
-            routeBundler = open('./routes/index.js', 'w')
-            routeBundlerLines = [routeBundlerLine for routeBundlerLine in routeBundlerLines if f"router.use(require('./{routeName}'))" not in routeBundlerLine]
-            for routeBundlerLine in routeBundlerLines:
-                routeBundler.write(routeBundlerLine)
-            routeBundler.close()
-            log(f'[{routeName}] routes deleted', True)
-
-def deleteValidator() -> None:
-    print('test')
-    if len(sys.argv) < 3: log('missing name of validator, use autumn delete:validator [name] or type autumn commands to list all available commands', False)
-    else:
-        validatorName = sys.argv[2].replace('.js', '')
-        if not os.path.isfile(f'./validators/{validatorName}.js'): log(f'skipping [{validatorName}] validators as it does not exist', False)
+            groupLines = compileGroup(pad + '\t')
+            if groupLines: lines.extend([f'{pad}if ({guard}) {{'] + groupLines + [f'{pad}}}'])
+
+    def stringGroup(pad: str) -> list:
+        groupLines = []
+        if schema.get('minLength'):
+            minimum = schema['minLength']
+            context['helpers'].add('codePoints')
+            groupLines.append(f"{pad}if ({value}.length < {minimum} || ({value}.length < {minimum * 2} && codePoints({value}) < {minimum})) {fail(f'must not have fewer than {minimum} characters')}")
+        if 'maxLength' in schema:
+            maximum = schema['maxLength']
+            context['helpers'].add('codePoints')
+            groupLines.append(f"{pad}if ({value}.length > {maximum} && codePoints({value}) > {maximum}) {fail(f'must not have more than {maximum} characters')}")
+        if 'pattern' in schema:
+            context['patterns'].append(schema['pattern'])
+            pattern = hoistConstant(context, 'pattern', f"new RegExp({jsString(schema['pattern'])}, 'u')")
+            groupLines.append(f"{pad}if (!{pattern}.test({value})) {fail(f'must match pattern ' + schema['pattern'])}")
+        if schema.get('format') in schemaFormats:
+            pattern = hoistConstant(context, 'pattern', f"new RegExp({jsString(schemaFormats[schema['format']])}, 'u')")
+            groupLines.append(f"{pad}if (!{pattern}.test({value})) {fail(f'must match format ' + schema['format'])}")
+        return groupLines
+
+    def numberGroup(pad: str) -> list:
+        groupLines = []
+        exclusiveMinimum, exclusiveMaximum = schema.get('exclusiveMinimum'), schema.get('exclusiveMaximum')
+        if 'minimum' in schema:
+            operator, bound = ('<=', '>') if exclusiveMinimum is True else ('<', '>=')
+            groupLines.append(f"{pad}if ({value} {operator} {json.dumps(schema['minimum'])}) {fail(f'must be {bound} ' + json.dumps(schema['minimum']))}")
+        if 'maximum' in schema:
+            operator, bound = ('>=', '<') if exclusiveMaximum is True else ('>', '<=')
+            groupLines.append(f"{pad}if ({value} {operator} {json.dumps(schema['maximum'])}) {fail(f'must be {bound} ' + json.dumps(schema['maximum']))}")
+        if not isinstance(exclusiveMinimum, bool) and exclusiveMinimum is not None: groupLines.append(f"{pad}if ({value} <= {json.dumps(exclusiveMinimum)}) {fail('must be > ' + json.dumps(exclusiveMinimum))}")
+        if not isinstance(exclusiveMaximum, bool) and exclusiveMaximum is not None: groupLines.append(f"{pad}if ({value} >= {json.dumps(exclusiveMaximum)}) {fail('must be < ' + json.dumps(exclusiveMaximum))}")
+        if 'multipleOf' in schema:
+            multipleOf = schema['multipleOf']
+            if not isinstance(multipleOf, int): context['helpers'].add('isMultipleOf')
+            check = f'{value} % {multipleOf} !== 0' if isinstance(multipleOf, int) else f'!isMultipleOf({value}, {json.dumps(multipleOf)})'
+            groupLines.append(f"{pad}if ({check}) {fail('must be multiple of ' + json.dumps(multipleOf))}")
+        return groupLines
+
+    def objectGroup(pad: str) -> list:
+        groupLines = []
+        properties = schema.get('properties', {})
+        required = list(dict.fromkeys(schema.get('required', [])))
+        for name in required:
+            if not name in properties: groupLines.append(f"{pad}if ({jsProperty(value, name)} === undefined) {fail(requiredMessage(name))}")
+        for name, propertySchema in properties.items():
+            propertyValue = schemaVariable(context, 'v')
+            propertyLines = compileSchemaNode(propertySchema, propertyValue, path + [(True, '/' + name.replace('~', '~0').replace('/', '~1'))], len(pad) + (0 if name in required else 1), context)
+            if not propertyLines and not name in required: continue
+            groupLines.append(f'{pad}const {propertyValue} = {jsProperty(value, name)}')
+            if name in required: groupLines += [f"{pad}if ({propertyValue} === undefined) {fail(requiredMessage(name))}"] + propertyLines
+            else: groupLines += [f'{pad}if ({propertyValue} !== undefined) {{'] + propertyLines + [f'{pad}}}']
+        additionalProperties = schema.get('additionalProperties', True)
+        if additionalProperties is not True and additionalProperties != {}:
+            key = schemaVariable(context, 'k')
+            known = hoistConstant(context, 'properties', 'new Set([' + ', '.join(jsString(name) for name in properties) + '])') + f'.has({key})' if properties else 'false'
+            if additionalProperties is False:
+                groupLines += [f'{pad}for (const {key} in {value}) {{', f"{pad}\tif (!{known}) {fail('must not have additional properties', path + [(True, '/'), (False, key)])}", f'{pad}}}']
+            else:
+                propertyValue = schemaVariable(context, 'v')
+                propertyLines = compileSchemaNode(additionalProperties, propertyValue, path + [(True, '/'), (False, key)], len(pad) + 1, context)
+                groupLines += [f'{pad}for (const {key} in {value}) {{'] + ([f'{pad}\tif ({known}) continue'] if properties else []) + [f'{pad}\tconst {propertyValue} = {value}[{key}]'] + propertyLines + [f'{pad}}}']
+        if 'minProperties' in schema or 'maxProperties' in schema:
+            count, key = schemaVariable(context, 'n'), schemaVariable(context, 'k')
+            groupLines += [f'{pad}let {count} = 0', f'{pad}for (const {key} in {value}) {count}++']
+            minimum, maximum = schema.get('minProperties'), schema.get('maxProperties')
+            if minimum is not None: groupLines.append(f"{pad}if ({count} < {minimum}) {fail(f'must not have fewer than {minimum} properties')}")
+            if maximum is not None: groupLines.append(f"{pad}if ({count} > {maximum}) {fail(f'must not have more than {maximum} properties')}")
+        return groupLines
+
+    def arrayGroup(pad: str) -> list:
+        groupLines = []
+        minimum, maximum = schema.get('minItems'), schema.get('maxItems')
+        if minimum: groupLines.append(f"{pad}if ({value}.length < {minimum}) {fail(f'must not have fewer than {minimum} items')}")
+        if maximum is not None: groupLines.append(f"{pad}if ({value}.length > {maximum}) {fail(f'must not have more than {maximum} items')}")
+        items = schema.get('items', True)
+        rest, start = items, 0
+        if isinstance(items, list):
+            for position, itemSchema in enumerate(items):
+                itemValue = schemaVariable(context, 'v')
+                itemLines = compileSchemaNode(itemSchema, itemValue, path + [(True, f'/{position}')], len(pad) + 1, context)
+                if itemLines: groupLines += [f'{pad}if ({value}.length > {position}) {{', f'{pad}\tconst {itemValue} = {value}[{position}]'] + itemLines + [f'{pad}}}']
+            rest, start = schema.get('additionalItems', True), len(items)
+        if rest is False: groupLines.append(f"{pad}if ({value}.length > {start}) {fail(f'must not have more than {start} items')}")
+        elif rest is not True and rest != {}:
+            index, itemValue = schemaVariable(context, 'i'), schemaVariable(context, 'v')
+            itemLines = compileSchemaNode(rest, itemValue, path + [(True, '/'), (False, index)], len(pad) + 1, context)
+            if itemLines: groupLines += [f'{pad}for (let {index} = {start}; {index} < {value}.length; {index}++) {{', f'{pad}\tconst {itemValue} = {value}[{index}]'] + itemLines + [f'{pad}}}']
+        if schema.get('uniqueItems') is True:
+            context['helpers'].add('uniqueItems')
+            groupLines.append(f"{pad}if (!uniqueItems({value})) {fail('must not have duplicate items')}")
+        return groupLines
+
+    guarded(['string'], schemaTypeChecks['string'].format(value), stringGroup)
+    guarded(['number', 'integer'], schemaTypeChecks['number'].format(value), numberGroup)
+    guarded(['object'], schemaTypeChecks['object'].format(value), objectGroup)
+    guarded(['array'], schemaTypeChecks['array'].format(value), arrayGroup)
+
+    for subschema in schema.get('allOf', []): lines += compileSchemaNode(subschema, value, path, indent, context)
+    if 'anyOf' in schema:
+        names = [subschemaFunction(context, subschema) for subschema in schema['anyOf']]
+        lines.append(f"{pad}if ({' && '.join(f'{name}({value}, {jsPath(path)}) !== null' for name in names)}) {fail('must match a schema in anyOf')}")
+    if 'oneOf' in schema:
+        names = [subschemaFunction(context, subschema) for subschema in schema['oneOf']]
+        count = schemaVariable(context, 'n')
+        lines.append(f'{pad}let {count} = 0')
+        lines += [f'{pad}if ({name}({value}, {jsPath(path)}) === null && ++{count} > 1) {fail("must match exactly one schema in oneOf")}' for name in names]
+        lines.append(f"{pad}if ({count} === 0) {fail('must match exactly one schema in oneOf')}")
+    if 'not' in schema:
+        name = subschemaFunction(context, schema['not'])
+        lines.append(f"{pad}if ({name}({value}, {jsPath(path)}) === null) {fail('must not match the schema in not')}")
+    return lines
+
+unicodePatternEscapes = 'dDwWsSbBfnrtv0cxupPk123456789^$\\.*+?()[]{}|/'
+
+def checkPatterns(patterns: list) -> None:
+    # patterns run with the u flag, which rejects identity escapes such as \- outside a character class
+    for pattern in patterns:
+        inClass = False
+        index = 0
+        while index < len(pattern):
+            if pattern[index] == '\\':
+                escaped = pattern[index + 1:index + 2]
+                if not escaped or not (escaped in unicodePatternEscapes or (inClass and escaped == '-')): raise ValueError(f'pattern [{pattern}] uses the escape [\\{escaped}] which is invalid in unicode regular expressions')
+                index += 2
+                continue
+            if pattern[index] == '[': inClass = True
+            elif pattern[index] == ']': inClass = False
+            index += 1
+    if not patterns or not shutil.which('node'): return
+    result = subprocess.run(['node', '-e', "for (const pattern of JSON.parse(require('fs').readFileSync(0, 'utf8'))) { try { new RegExp(pattern, 'u') } catch (error) { console.log(error.message); process.exit(1) } }"], input=json.dumps(patterns), capture_output=True, text=True)
+    if result.returncode: raise ValueError(result.stdout.strip() or result.stderr.strip())
+
+def compileValidator(schema, schemaPath: str, schemaHash: str) -> str:
+    context = {'root': schema, 'constants': {}, 'functions': {}, 'references': {}, 'subschemas': {}, 'patterns': [], 'helpers': set(), 'counter': 0}
+    body = compileSchemaNode(schema, 'data', [], 1, context)
+    checkPatterns(context['patterns'])
+    sections = ['\n'.join(f'const {name} = {expression}' for expression, name in context['constants'].items())] if context['constants'] else []
+    sections += [validatorHelpers[helper] for helper in sorted(context['helpers'])] + list(context['functions'].values())
+    return f"""{validatorHeader}{schemaPath}] sha256:{schemaHash}, edit the schema and run autumn build:validators instead of this file
+// returns null when data is valid, otherwise the first error as {{ path, message }}
+{''.join(section + chr(10) + chr(10) for section in sections)}module.exports = function validate(data) {{
+{''.join(line + chr(10) for line in body)}	return null
+}}
+"""
+
+def loadSchema(schemaPath: str) -> tuple:
+    schemaFile = open(schemaPath, 'r', encoding='utf-8')
+    schema = json.load(schemaFile)
+    schemaFile.close()
+    return schema, hashlib.sha256(f'{validatorCompilerVersion}\n{json.dumps(schema, sort_keys=True)}'.encode()).hexdigest()
+
+def readValidatorHeader(validatorPath: str) -> tuple:
+    validator = open(validatorPath, 'r', encoding='utf-8')
+    header = validator.readline()
+    validator.close()
+    if not header.startswith(validatorHeader) or not '] sha256:' in header: return None
+    schemaPath, rest = header[len(validatorHeader):].split('] sha256:', 1)
+    return schemaPath, rest.split(',', 1)[0].strip()
+
+def compileSchemaFile(schemaPath: str) -> tuple:
+    try:
+        schema, schemaHash = loadSchema(schemaPath)
+        return compileValidator(schema, schemaPath, schemaHash), schemaHash
+    except (OSError, ValueError, RecursionError) as error:
+        log(f'[{schemaPath}] cannot be compiled: {error}', False)
+        return None, None
+
+def writeSchemaValidator(name: str, schemaPath: str, source: str, schemaHash: str) -> bool:
+    validatorPath = f'./validators/{name}.js'
+    with fileLock(validatorPath):
+        if os.path.isfile(validatorPath):
+            header = readValidatorHeader(validatorPath)
+            if header is None:
+                log(f'skipping [{name}] validator as it already exists and is not generated from a schema', False)
+                return False
+            if header == (schemaPath, schemaHash):
+                log(f'skipping [{name}] validator as it is up to date with [{schemaPath}]', False)
+                return False
+        writeAtomic(validatorPath, source)
+    return True
+
+def makeSchemaValidators(schemaPath: str) -> bool:
+    names = commandNames()
+    if not names:
+        log('missing name of validator, use autumn make:validator [name ...] --schema file or type autumn commands to list all available commands', False)
+        return False
+    schemaPath = os.path.relpath(schemaPath).replace(os.sep, '/')
+    source, schemaHash = compileSchemaFile(schemaPath)
+    if source is None: return False
+    written = [name for name in names if writeSchemaValidator(name, schemaPath, source, schemaHash)]
+    if not written: return True
+    updateBundler('validator', added=written)
+    for name in written: log(f'[{name}] validator compiled from [{schemaPath}]', True)
+    return True
+
+def buildValidators() -> bool:
+    divider('compiling validators')
+    compiled = 0
+    failed = 0
+    schemas = {}
+    for fileName in sorted(os.listdir('./validators')):
+        if not fileName.endswith('.js') or fileName == 'index.js': continue
+        header = readValidatorHeader(f'./validators/{fileName}')
+        if header is None: continue
+        name, schemaPath = fileName[:-3], header[0]
+        if not os.path.isfile(schemaPath):
+            log(f'skipping [{name}] validator as its schema [{schemaPath}] does not exist', False)
+            continue
+        if not schemaPath in schemas: schemas[schemaPath] = compileSchemaFile(schemaPath)
+        source, schemaHash = schemas[schemaPath]
+        if source is None:
+            failed += 1
+            log(f'skipping [{name}] validator as its schema [{schemaPath}] cannot be compiled', False)
+        elif writeSchemaValidator(name, schemaPath, source, schemaHash):
+            compiled += 1
+            log(f'[{name}] validator recompiled from [{schemaPath}]', True)
+    log(f'{compiled} validators recompiled', True)
+    return not failed
+
+routeMethods = ['get', 'post', 'put', 'patch', 'delete', 'options', 'head', 'all']
+punctuators = '()[]{},.;:=<>+-*/%!&|^~?@#'
+regexPrecedingKeywords = ['return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void', 'throw', 'case', 'do', 'else', 'yield', 'await']
+
+def skipString(source: str, index: int) -> int:
+    quote = source[index]
+    index += 1
+    while index < len(source):
+        if source[index] == '\\': index += 2
+        elif source[index] == quote or source[index] == '\n': return index + 1
+        else: index += 1
+    return index
+
+def skipTemplate(source: str, index: int) -> int:
+    index += 1
+    while index < len(source):
+        char = source[index]
+        if char == '\\': index += 2
+        elif char == '`': return index + 1
+        elif char == '$' and source[index + 1:index + 2] == '{':
+            index += 2
+            depth = 1
+            while index < len(source) and depth:
+                char = source[index]
+                if char in '\'"': index = skipString(source, index)
+                elif char == '`': index = skipTemplate(source, index)
+                else:
+                    if char == '{': depth += 1
+                    elif char == '}': depth -= 1
+                    index += 1
+        else: index += 1
+    return index
+
+def skipRegex(source: str, index: int) -> int:
+    index += 1
+    inClass = False
+    while index < len(source):
+        char = source[index]
+        if char == '\\': index += 2
+        elif char == '\n': return index
+        elif char == '[': inClass, index = True, index + 1
+        elif char == ']': inClass, index = False, index + 1
+        elif char == '/' and not inClass:
+            index += 1
+            while index < len(source) and (source[index].isalnum() or source[index] == '_'): index += 1
+            return index
+        else: index += 1
+    return index
+
+def tokenize(source: str) -> list:
+    tokens = []
+    index = 0
+    line = 1
+    length = len(source)
+    while index < length:
+        char = source[index]
+        if char == '\n':
+            line += 1
+            index += 1
+            continue
+        if char.isspace():
+            index += 1
+            continue
+        start = index
+        if char == '/' and source[index + 1:index + 2] == '/':
+            end = source.find('\n', index)
+            index = length if end == -1 else end
+            continue
+        if char == '/' and source[index + 1:index + 2] == '*':
+            end = source.find('*/', index + 2)
+            end = length if end == -1 else end + 2
+            line += source.count('\n', index, end)
+            index = end
+            continue
+        if char in '\'"': kind, index = 'string', skipString(source, index)
+        elif char == '`': kind, index = 'template', skipTemplate(source, index)
+        elif char == '/' and (not tokens or (tokens[-1][0] == 'punct' and tokens[-1][1] not in ')]}') or (tokens[-1][0] == 'name' and tokens[-1][1] in regexPrecedingKeywords)):
+            kind, index = 'regex', skipRegex(source, index)
+        elif char.isalnum() or char in '_$':
+            index += 1
+            while index < length and (source[index].isalnum() or source[index] in '_$'): index += 1
+            kind = 'name'
+        elif char in punctuators: kind, index = 'punct', index + 1
         else:
-            os.remove(f'./validators/{validatorName}.js')
-            validatorBundler = open('./validators/index.js', 'r')
-            validatorBundlerLines = validatorBundler.readlines()
-            validatorBundler.close()
-            validatorBundler = open('./validators/index.js', 'w')
-            validatorBundlerLines = [validatorBundlerLine for validatorBundlerLine in validatorBundlerLines if f"module.exports.{validatorName} = require('./{validatorName}')" not in validatorBundlerLine]
-            for validatorBundlerLine in validatorBundlerLines:
-                validatorBundler.write(validatorBundlerLine)
-            validatorBundler.close()
-            log(f'[{validatorName}] validators deleted', True)
+            index += 1
+            continue
+        tokens.append((kind, source[start:index], start, index, line))
+        if kind != 'name' and kind != 'punct': line += source.count('\n', start, index)
+    return tokens
+
+def parseArguments(tokens: list, index: int) -> tuple:
+    arguments = []
+    depth = 0
+    argumentStart = index
+    while index < len(tokens):
+        kind, text = tokens[index][0], tokens[index][1]
+        if kind == 'punct':
+            if text in '([{': depth += 1
+            elif text in ')]}':
+                if depth == 0:
+                    if argumentStart < index: arguments.append(tokens[argumentStart:index])
+                    return arguments, index + 1
+                depth -= 1
+            elif text == ',' and depth == 0:
+                arguments.append(tokens[argumentStart:index])
+                argumentStart = index + 1
+        index += 1
+    return arguments, index
+
+def argumentSource(source: str, argument: list) -> str:
+    return ' '.join(source[argument[0][2]:argument[-1][3]].split())
+
+def isLiteralPath(argument: list) -> bool:
+    return len(argument) == 1 and (argument[0][0] == 'string' or (argument[0][0] == 'template' and '${' not in argument[0][1]))
+
+def routePath(source: str, argument: list) -> str:
+    if isLiteralPath(argument): return argument[0][1][1:-1]
+    return argumentSource(source, argument)
+
+def parseRoutes(source: str, fileName: str) -> list:
+    tokens = tokenize(source)
+    routes = []
+    index = 0
+    while index < len(tokens) - 3:
+        if tokens[index][1] != 'router' or tokens[index + 1][1] != '.' or tokens[index][0] != 'name':
+            index += 1
+            continue
+        method, line = tokens[index + 2][1], tokens[index][4]
+        if method in routeMethods and tokens[index + 3][1] == '(':
+            arguments, index = parseArguments(tokens, index + 4)
+            if arguments: routes.append({
+                'method': method.upper(),
+                'path': routePath(source, arguments[0]),
+                'middlewares': [argumentSource(source, argument) for argument in arguments[1:-1]],
+                'file': fileName,
+                'line': line,
+                'literal': isLiteralPath(arguments[0]),
+            })
+        elif method == 'route' and tokens[index + 3][1] == '(':
+            arguments, index = parseArguments(tokens, index + 4)
+            path = routePath(source, arguments[0]) if arguments else ''
+            literal = bool(arguments) and isLiteralPath(arguments[0])
+            while index < len(tokens) - 2 and tokens[index][1] == '.' and tokens[index + 1][1] in routeMethods and tokens[index + 2][1] == '(':
+                method, line = tokens[index + 1][1], tokens[index + 1][4]
+                arguments, index = parseArguments(tokens, index + 3)
+                routes.append({
+                    'method': method.upper(),
+                    'path': path,
+                    'middlewares': [argumentSource(source, argument) for argument in arguments[:-1]],
+                    'file': fileName,
+                    'line': line,
+                    'literal': literal,
+                })
+        else: index += 3
+    return routes
+
+routeDispatcherName = 'dispatcher.js'
+
+def routeFiles() -> list:
+    return sorted(routeFileName for routeFileName in os.listdir('./routes') if routeFileName.endswith('.js') and not routeFileName in ['index.js', routeDispatcherName])
+
+routeIndexPath = './.autumn/routes.json'
+routeIndexVersion = 2
+parallelParseThreshold = 64
+
+def parseRouteFile(routeFileName: str, knownHash: str) -> tuple:
+    routeFile = open(f'./routes/{routeFileName}', 'rb')
+    content = routeFile.read()
+    routeFile.close()
+    contentHash = hashlib.sha256(content).hexdigest()
+    if contentHash == knownHash: return routeFileName, contentHash, None
+    return routeFileName, contentHash, parseRoutes(content.decode('utf-8', 'replace'), routeFileName)
+
+def loadRoutes() -> list:
+    entries = {}
+    if os.path.isfile(routeIndexPath):
+        try:
+            routeIndex = open(routeIndexPath, 'r', encoding='utf-8')
+            routeIndexFromJson = json.load(routeIndex)
+            routeIndex.close()
+            if routeIndexFromJson.get('version') == routeIndexVersion: entries = routeIndexFromJson['files']
+        except (ValueError, KeyError, OSError): log('route index is corrupted, rebuilding it', False)
+
+    files = {}
+    staleFiles = []
+    for routeFileName in routeFiles():
+        stat = os.stat(f'./routes/{routeFileName}')
+        entry = entries.get(routeFileName)
+        files[routeFileName] = {'mtime': stat.st_mtime_ns, 'size': stat.st_size, 'hash': entry['hash'] if entry else None, 'routes': entry['routes'] if entry else []}
+        if not entry or entry['mtime'] != stat.st_mtime_ns or entry['size'] != stat.st_size: staleFiles.append(routeFileName)
+
+    if staleFiles:
+        knownHashes = [files[routeFileName]['hash'] for routeFileName in staleFiles]
+        if len(staleFiles) >= parallelParseThreshold:
+            with ProcessPoolExecutor() as pool: results = list(pool.map(parseRouteFile, staleFiles, knownHashes, chunksize=max(1, len(staleFiles) // ((os.cpu_count() or 1) * 4))))
+        else: results = list(map(parseRouteFile, staleFiles, knownHashes))
+        # files touched within the last second may still change without moving their mtime, so they are re-hashed next time
+        recent = time.time_ns() - 1_000_000_000
+        for routeFileName, contentHash, routes in results:
+            files[routeFileName]['hash'] = contentHash
+            if routes is not None: files[routeFileName]['routes'] = routes
+            if files[routeFileName]['mtime'] > recent: files[routeFileName]['mtime'] = None
+
+    if staleFiles or len(files) != len(entries):
+        os.makedirs('./.autumn', exist_ok=True)
+        writeAtomic(routeIndexPath, json.dumps({'version': routeIndexVersion, 'files': files}))
+
+    return [route for routeFileName in sorted(files) for route in files[routeFileName]['routes']]
+
+routeFields = ['method', 'path', 'middlewares', 'file', 'line']
 
 def listRoutes() -> None:
-    routes = [['METHOD', 'PATH', 'MIDDLEWARES']]
-    routeStrings = []
-    for routeFileName in os.listdir('./routes'):
-        if not routeFileName == 'index.js':
-            routeFile = open(f'./routes/{routeFileName}', 'r')
-            lines = routeFile.readlines()
-            for lineIndex, line in enumerate(lines):
-                wholeLine = ''
-                if 'router.' in line:
-                    wholeLine += line
-                    if not '(req, res)' in line:
-                        found = False
-                        for subline in lines[lineIndex + 1:]:
-                            if not found: wholeLine += subline
-                            if '(req, res)' in subline:
-                                found = True
-                if wholeLine: routeStrings.append(wholeLine.replace('\n', '').replace('\t', '').strip())
-    for routeString in routeStrings:
-        route = []
-        route.append(routeString.split('.')[1].split('(')[0].upper())
-        route.append(routeString.split("'")[1])
-        route.append(', '.join(routeString.split(",")[1:-2]))
-        routes.append(route)
-    print(table(routes, '-', '|', '='))
-
-try:
-    if sys.argv[1] == 'commands': commands()
-    elif sys.argv[1] == 'scaffold': scaffold()
-
-    elif sys.argv[1] == 'start:prod': os.system('npm run start:prod')
-    elif sys.argv[1] == 'start:dev': os.system('npm run start:dev')
-
-    elif sys.argv[1] == 'make:helper': makeHelper()
-    elif sys.argv[1] == 'make:middleware': makeMiddleware()
-    elif sys.argv[1] == 'make:model': makeModel()
-    elif sys.argv[1] == 'make:route': makeRoute()
-    elif sys.argv[1] == 'make:validator': makeValidator()
-
-    elif sys.argv[1] == 'delete:helper': deleteHelper()
-    elif sys.argv[1] == 'delete:middleware': deleteMiddleware()
-    elif sys.argv[1] == 'delete:model': deleteModel()
-    elif sys.argv[1] == 'delete:route': deleteRoute()
-    elif sys.argv[1] == 'delete:validator': deleteValidator()
-
-    elif sys.argv[1] == 'list:routes': listRoutes()
+    global muted
+    outputFormat = next((argument[2:] for argument in sys.argv[2:] if argument in ['--json', '--ndjson', '--csv']), None)
+    if outputFormat: muted = True
+    routes = loadRoutes()
+    if outputFormat == 'json':
+        sys.stdout.write('[')
+        for routeIndex, route in enumerate(routes): sys.stdout.write((',\n' if routeIndex else '\n') + json.dumps({field: route[field] for field in routeFields}))
+        sys.stdout.write('\n]\n')
+    elif outputFormat == 'ndjson':
+        for route in routes: sys.stdout.write(json.dumps({field: route[field] for field in routeFields}) + '\n')
+    elif outputFormat == 'csv':
+        writer = csv.writer(sys.stdout, lineterminator='\n')
+        writer.writerow(routeFields)
+        for route in routes: writer.writerow([route['method'], route['path'], ', '.join(route['middlewares']), route['file'], route['line']])
+    else: writeTable(chain([['METHOD', 'PATH', 'MIDDLEWARES']], ([route['method'], route['path'], ', '.join(route['middlewares'])] for route in routes)), '-', '|', '=')
+
+def routePattern(path: str) -> list:
+    if not path.startswith('/'): return None
+    segments = path[1:].split('/')
+    if segments[-1] == '': segments.pop()
+    pattern = []
+    for segment in segments:
+        if segment.startswith(':') and segment[1:2] and (segment[1].isalpha() or segment[1] in '_$') and all(char.isalnum() or char in '_$' for char in segment[1:]): pattern.append((':', segment[1:]))
+        elif any(char in segment for char in ':*?()+[]'): return None
+        else: pattern.append(('', segment.lower()))
+    return pattern
+
+def findSubsuming(node: dict, pattern: list, index: int = 0):
+    if index == len(pattern):
+        yield node
+        return
+    kind, segment = pattern[index]
+    if kind == '' and segment in node['s']: yield from findSubsuming(node['s'][segment], pattern, index + 1)
+    if node['p'] is not None: yield from findSubsuming(node['p'], pattern, index + 1)
+
+def emptyRouteNode() -> dict:
+    return {'s': {}, 'p': None, 'e': []}
+
+def insertRoute(tree: dict, pattern: list, routeIndex: int) -> None:
+    node = tree
+    for kind, segment in pattern:
+        if kind:
+            node['p'] = node['p'] or emptyRouteNode()
+            node = node['p']
+        else: node = node['s'].setdefault(segment, emptyRouteNode())
+    node['e'].append(routeIndex)
+
+def compactRouteNode(node: dict) -> dict:
+    compact = {}
+    if node['s']: compact['s'] = {segment: compactRouteNode(child) for segment, child in node['s'].items()}
+    if node['p'] is not None: compact['p'] = compactRouteNode(node['p'])
+    if node['e']: compact['e'] = node['e']
+    return compact
+
+def buildRoutes() -> None:
+    divider('reading route autoloader')
+    autoloader = open('./routes/index.js', 'r', encoding='utf-8')
+    linkedFiles = [token[1][3:-1] + '.js' for token in tokenize(autoloader.read()) if token[0] == 'string' and token[1][1:3] == './']
+    autoloader.close()
+    linkedFiles = [routeFileName for routeFileName in dict.fromkeys(linkedFiles) if os.path.isfile(f'./routes/{routeFileName}')]
+    for routeFileName in routeFiles():
+        if not routeFileName in linkedFiles: log(f'skipping [{routeFileName}] as it is not linked in the route autoloader', False)
+
+    fallbackFiles = []
+    for routeFileName in linkedFiles:
+        routeFile = open(f'./routes/{routeFileName}', 'r', encoding='utf-8')
+        tokens = tokenize(routeFile.read())
+        routeFile.close()
+        if any(tokens[index][1] == 'router' and tokens[index + 1][1] == '.' and tokens[index + 2][1] in ['use', 'param'] for index in range(len(tokens) - 2)):
+            fallbackFiles.append(routeFileName)
+            log(f'[{routeFileName}] uses router.use or router.param, its routes are served by its own router', False)
+
+    routesByFile = {}
+    for route in loadRoutes(): routesByFile.setdefault(route['file'], []).append(route)
+    for routeFileName in linkedFiles:
+        uncompiledRoute = next((route for route in routesByFile.get(routeFileName, []) if not route['literal'] or routePattern(route['path']) is None), None)
+        if uncompiledRoute and not routeFileName in fallbackFiles:
+            fallbackFiles.append(routeFileName)
+            log(f"[{uncompiledRoute['method']} {uncompiledRoute['path']}] can not be precompiled, [{routeFileName}] is served by its own router", False)
+    fallbackFiles = [routeFileName for routeFileName in linkedFiles if routeFileName in fallbackFiles]
+
+    divider('building route tree')
+    tree = emptyRouteNode()
+    conflictTree = emptyRouteNode()
+    linkedRoutes = []
+    compiledRoutes = []
+    issues = [['ISSUE', 'ROUTE', 'CONFLICTS WITH']]
+    for route in (route for routeFileName in linkedFiles for route in routesByFile.get(routeFileName, [])):
+        pattern = routePattern(route['path']) if route['literal'] else None
+        if pattern is None: continue
+        for node in findSubsuming(conflictTree, pattern):
+            for routeIndex in node['e']:
+                other = linkedRoutes[routeIndex]
+                if not (other['method'] == route['method'] or 'ALL' in [other['method'], route['method']]): continue
+                issue = 'duplicate' if [kind for kind, segment in other['pattern']] == [kind for kind, segment in pattern] else 'shadowed'
+                issues.append([issue, f"{route['method']} {route['path']} ({route['file']}:{route['line']})", f"{other['method']} {other['path']} ({other['file']}:{other['line']})"])
+        insertRoute(conflictTree, pattern, len(linkedRoutes))
+        linkedRoutes.append({**route, 'pattern': pattern})
+        if not route['file'] in fallbackFiles:
+            insertRoute(tree, pattern, len(compiledRoutes))
+            compiledRoutes.append(linkedRoutes[-1])
+    log(f'{len(compiledRoutes)} routes precompiled, {len(fallbackFiles)} route files served by their own router', True)
+    fileOrder = {routeFileName: fileIndex for fileIndex, routeFileName in enumerate(linkedFiles)}
+    fallbackPositions = [sum(1 for route in compiledRoutes if fileOrder[route['file']] < fileOrder[routeFileName]) for routeFileName in fallbackFiles]
+    for routeFileName, position in zip(fallbackFiles, fallbackPositions):
+        if position < len(compiledRoutes): log(f'[{routeFileName}] is mounted before {len(compiledRoutes) - position} precompiled routes, its router keeps running ahead of them on every request, mount it last in the route autoloader if its middlewares do not apply to them', False)
+
+    if len(issues) > 1:
+        divider('route conflicts')
+        writeTable(issues, '-', '|', '=')
+        log('shadowed routes only run when the routes registered before them call next(), as in express', False)
+
+    divider('writing route dispatcher')
+    dispatcherFiles = list(dict.fromkeys([route['file'] for route in compiledRoutes] + fallbackFiles))
+    writeAtomic(f'./routes/{routeDispatcherName}', logoCommented + f"""\n// this dispatcher is generated by autumn build:routes, run it again after changing routes instead of editing this file
+const files = {json.dumps(['./' + routeFileName[:-3] for routeFileName in dispatcherFiles])}
+const routers = files.map((file) => require(file))
+const routes = {json.dumps([[dispatcherFiles.index(route['file']), route['method'].lower(), route['path'], [segment for kind, segment in route['pattern'] if kind]] for route in compiledRoutes])}
+const tree = {json.dumps(compactRouteNode(tree), separators=(',', ':'))}
+// fallback routers run at their position in the route autoloader, before the precompiled routes mounted after them
+const fallbacks = {json.dumps([[position, dispatcherFiles.index(routeFileName)] for routeFileName, position in zip(fallbackFiles, fallbackPositions)])}.map(([position, fileIndex]) => [position, routers[fileIndex]])
+const hasOwn = Object.prototype.hasOwnProperty
+
+const claimed = new Set()
+const resolved = routes.map(([fileIndex, method, path, params]) => {{
+	const layer = routers[fileIndex].stack.find((layer) => layer.route && !claimed.has(layer) && layer.route.path === path && (layer.route.methods[method] || layer.route.methods._all))
+	if (!layer) throw new Error(`[${{method.toUpperCase()}} ${{path}}] in [${{files[fileIndex]}}] changed since the last autumn build:routes`)
+	claimed.add(layer)
+	return {{ route: layer.route, params }}
+}})
+
+function handles(route, method) {{
+	if (route.methods._all) return true
+	return Boolean(route.methods[method] || (method === 'head' && route.methods.get))
+}}
+
+// collects every route matching the path and the method, the caller runs them in registration order like express
+function match(node, segments, index, values, method, found) {{
+	if (index === segments.length) {{
+		if (node.e) for (const entry of node.e) if (handles(resolved[entry].route, method)) found.push([entry, values.slice()])
+		return
+	}}
+	const segment = segments[index]
+	if (node.s) {{
+		const key = segment.toLowerCase()
+		if (hasOwn.call(node.s, key)) match(node.s[key], segments, index + 1, values, method, found)
+	}}
+	if (node.p && segment !== '') {{
+		values.push(segment)
+		match(node.p, segments, index + 1, values, method, found)
+		values.pop()
+	}}
+}}
+
+function decode(value) {{
+	try {{
+		return decodeURIComponent(value)
+	}} catch (error) {{
+		return value
+	}}
+}}
+
+module.exports = function dispatcher(req, res, next) {{
+	let path = req.path
+	if (path.length > 1 && path.endsWith('/')) path = path.slice(0, -1)
+	const found = []
+	match(tree, path === '/' ? [] : path.slice(1).split('/'), 0, [], req.method.toLowerCase(), found)
+	if (found.length > 1) found.sort((a, b) => a[0] - b[0])
+	let entryIndex = 0
+	let fallbackIndex = 0
+	let fileIndex = -1
+	const step = (error) => {{
+		if (error === 'router') {{
+			// next('router') leaves the router of the current route file only, the next mounted file still runs
+			while (entryIndex < found.length && routes[found[entryIndex][0]][0] === fileIndex) entryIndex++
+			error = undefined
+		}}
+		if (error) return next(error)
+		if (fallbackIndex < fallbacks.length && (entryIndex === found.length || fallbacks[fallbackIndex][0] <= found[entryIndex][0])) {{
+			fileIndex = -1
+			return fallbacks[fallbackIndex++][1](req, res, step)
+		}}
+		if (entryIndex < found.length) {{
+			const [entry, values] = found[entryIndex++]
+			const {{ route, params }} = resolved[entry]
+			fileIndex = routes[entry][0]
+			req.params = {{}}
+			for (let paramIndex = 0; paramIndex < params.length; paramIndex++) req.params[params[paramIndex]] = decode(values[paramIndex])
+			return route.dispatch(req, res, step)
+		}}
+		next()
+	}}
+	step()
+}}
+""")
+    log(f"route dispatcher written to [./routes/{routeDispatcherName}], use app.use(require('./routes/dispatcher')) instead of app.use(routes) to enable it", True)
+
+staticBuildPath = './build/static'
+staticManifestVersion = 1
+parallelAssetThreshold = 8
+
+def writeStaticAssetsMiddleware() -> None:
+    middleware = open('./middlewares/staticAssets.js', 'w')
+    middleware.write("""// serves the fingerprinted and precompressed files written by autumn build:static, anything else falls through to express.static
+const fs = require('fs')
+const path = require('path')
+
+const root = path.join(__dirname, '..', 'build', 'static')
+// outside production only fingerprinted urls come from the build, so edits in ./static show up without autumn build:static
+const production = process.env.NODE_ENV === 'production'
+const assets = new Map()
+const urls = {}
+
+let manifest = { assets: {} }
+try {
+	manifest = JSON.parse(fs.readFileSync(path.join(root, 'manifest.json'), 'utf8'))
+} catch (error) {}
+
+for (const [name, asset] of Object.entries(manifest.assets)) {
+	const etag = `"${asset.hash.slice(0, 32)}"`
+	const variants = (immutable) => {
+		const headers = (encoding, size) => {
+			const headers = {
+				'Content-Type': asset.type,
+				'Content-Length': size,
+				'Cache-Control': immutable ? 'public, max-age=31536000, immutable' : 'public, max-age=0, must-revalidate',
+				ETag: etag,
+				Vary: 'Accept-Encoding'
+			}
+			if (encoding) headers['Content-Encoding'] = encoding
+			return headers
+		}
+		return {
+			etag,
+			identity: { file: path.join(root, asset.file), headers: headers(null, asset.size) },
+			gzip: asset.gzip ? { file: path.join(root, `${asset.file}.gz`), headers: headers('gzip', asset.gzip) } : null,
+			br: asset.br ? { file: path.join(root, `${asset.file}.br`), headers: headers('br', asset.br) } : null
+		}
+	}
+	assets.set(`/${asset.file}`, variants(true))
+	if (!production) continue
+	assets.set(`/${name}`, variants(false))
+	urls[name] = `/static/${asset.file}`
+}
+
+module.exports = function staticAssets(req, res, next) {
+	if (req.method !== 'GET' && req.method !== 'HEAD') return next()
+	const asset = assets.get(req.path)
+	if (asset === undefined) return next()
+	const acceptEncoding = req.headers['accept-encoding'] || ''
+	const variant = asset.br && acceptEncoding.includes('br') ? asset.br : asset.gzip && acceptEncoding.includes('gzip') ? asset.gzip : asset.identity
+	if (req.headers['if-none-match'] === asset.etag) {
+		res.writeHead(304, { ETag: asset.etag, 'Cache-Control': variant.headers['Cache-Control'], Vary: 'Accept-Encoding' })
+		return res.end()
+	}
+	res.writeHead(200, variant.headers)
+	if (req.method === 'HEAD') return res.end()
+	fs.createReadStream(variant.file).on('error', next).pipe(res)
+}
+
+// url of the fingerprinted file for a path inside ./static, e.g. asset('css/app.css') in a view
+module.exports.asset = (name) => urls[name] || `/static/${name}`
+""")
+    middleware.close()
+    updateBundler('middleware', added=['staticAssets'])
+
+nodeBrotliScript = "process.stdout.write(require('zlib').brotliCompressSync(require('fs').readFileSync(0)))"
+
+def brotliAvailable() -> bool:
+    return brotli is not None or shutil.which('node') is not None
+
+def brotliCompress(content: bytes) -> bytes:
+    if brotli: return brotli.compress(content)
+    return subprocess.run(['node', '-e', nodeBrotliScript], input=content, capture_output=True, check=True).stdout
+
+def processAsset(name: str, previous: dict) -> dict:
+    sourceFile = open(os.path.join('./static', name), 'rb')
+    content = sourceFile.read()
+    sourceFile.close()
+    contentHash = hashlib.sha256(content).hexdigest()
+    compressBrotli = brotliAvailable()
+    if previous and previous['hash'] == contentHash and os.path.isfile(os.path.join(staticBuildPath, previous['file'])) and (previous.get('brotli') or not compressBrotli): return None
+    root, extension = os.path.splitext(name)
+    assetFile = f'{root}.{contentHash[:10]}{extension}'.replace(os.sep, '/')
+    os.makedirs(os.path.dirname(os.path.join(staticBuildPath, assetFile)), exist_ok=True)
+    asset = {'file': assetFile, 'hash': contentHash, 'size': len(content), 'gzip': 0, 'br': 0, 'brotli': compressBrotli}
+    variants = [('', content), ('gzip', gzip.compress(content, 9, mtime=0))]
+    if compressBrotli: variants.append(('br', brotliCompress(content)))
+    for encoding, variant in variants:
+        if encoding and len(variant) >= len(content): continue
+        variantPath = os.path.join(staticBuildPath, assetFile + {'': '', 'gzip': '.gz', 'br': '.br'}[encoding])
+        variantFile = open(variantPath + f'.{os.getpid()}.tmp', 'wb')
+        variantFile.write(variant)
+        variantFile.close()
+        os.replace(variantPath + f'.{os.getpid()}.tmp', variantPath)
+        if encoding: asset[encoding] = len(variant)
+    if previous and previous['file'] != assetFile: removeAsset(previous['file'])
+    return asset
+
+def removeAsset(assetFile: str) -> None:
+    for suffix in ['', '.gz', '.br']:
+        with contextlib.suppress(FileNotFoundError): os.remove(os.path.join(staticBuildPath, assetFile + suffix))
+
+def assetType(name: str) -> str:
+    return mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+def buildStatic() -> None:
+    divider('reading static assets')
+    manifestPath = os.path.join(staticBuildPath, 'manifest.json')
+    previousAssets = {}
+    if os.path.isfile(manifestPath):
+        manifest = open(manifestPath, 'r', encoding='utf-8')
+        with contextlib.suppress(ValueError):
+            manifestFromJson = json.load(manifest)
+            if manifestFromJson.get('version') == staticManifestVersion: previousAssets = manifestFromJson['assets']
+        manifest.close()
+    compressBrotli = brotliAvailable()
+    if not compressBrotli: log('neither the brotli package (pip install brotli) nor node is installed, skipping .br variants', False)
+
+    assets = {}
+    staleNames = []
+    for folder, folderNames, fileNames in os.walk('./static'):
+        folderNames.sort()
+        for fileName in sorted(fileNames):
+            name = os.path.relpath(os.path.join(folder, fileName), './static').replace(os.sep, '/')
+            stat = os.stat(os.path.join(folder, fileName))
+            previous = previousAssets.get(name)
+            if previous and previous['mtime'] == stat.st_mtime_ns and previous['size'] == stat.st_size and (previous.get('brotli') or not compressBrotli): assets[name] = previous
+            else: staleNames.append((name, stat))
+
+    divider('fingerprinting and compressing')
+    names = [name for name, stat in staleNames]
+    previous = [previousAssets.get(name) for name in names]
+    if len(names) >= parallelAssetThreshold:
+        with ProcessPoolExecutor() as pool: results = list(pool.map(processAsset, names, previous))
+    else: results = list(map(processAsset, names, previous))
+    processed = 0
+    for (name, stat), asset in zip(staleNames, results):
+        if asset is None: asset = previousAssets[name]
+        else:
+            processed += 1
+            log(f"[{name}] -> [{asset['file']}]", True)
+        assets[name] = {**asset, 'type': assetType(name), 'mtime': stat.st_mtime_ns, 'size': stat.st_size}
+    for name in previousAssets:
+        if not name in assets:
+            removeAsset(previousAssets[name]['file'])
+            log(f'[{name}] removed', True)
+    log(f'{processed} assets processed, {len(assets) - processed} unchanged', True)
+
+    os.makedirs(staticBuildPath, exist_ok=True)
+    writeAtomic(manifestPath, json.dumps({'version': staticManifestVersion, 'assets': assets}, indent=2))
+    if not os.path.isfile('./middlewares/staticAssets.js') and os.path.isdir('./middlewares'):
+        writeStaticAssetsMiddleware()
+        log("staticAssets middleware created, mount it with app.use('/static', middlewares.staticAssets, express.static('./static'))", True)
+
+def readEnv() -> dict:
+    env = {}
+    if not os.path.isfile('./.env'): return env
+    envFile = open('./.env', 'r', encoding='utf-8')
+    for line in envFile:
+        key, separator, value = line.strip().partition('=')
+        if separator and not key.startswith('#'): env[key.strip()] = value.strip().strip('\'"')
+    envFile.close()
+    return env
+
+def optionValue(name: str, default: str = None) -> str:
+    for index, argument in enumerate(sys.argv):
+        if argument == name and index + 1 < len(sys.argv): return sys.argv[index + 1]
+        if argument.startswith(name + '='): return argument[len(name) + 1:]
+    return default
+
+routeStatsPath = './.autumn/stats'
+
+def writeRouteStatsMiddleware() -> None:
+    middleware = open('./middlewares/routeStats.js', 'w')
+    middleware.write("""// per route latency histograms, dumped to .autumn/stats/<pid>.json and read by autumn stats
+const fs = require('fs')
+const path = require('path')
+const { performance } = require('perf_hooks')
+
+// upper bounds in milliseconds, the last bucket counts everything slower
+const bounds = [0.25, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+const sumIndex = bounds.length + 1
+const folder = path.join(__dirname, '..', '.autumn', 'stats')
+const file = path.join(folder, `${process.pid}.json`)
+const started = Date.now()
+const methods = new Map()
+
+function histogram(method, route) {
+	let routes = methods.get(method)
+	if (routes === undefined) {
+		routes = new Map()
+		methods.set(method, routes)
+	}
+	let counts = routes.get(route)
+	if (counts === undefined) {
+		counts = new Float64Array(bounds.length + 2)
+		routes.set(route, counts)
+	}
+	return counts
+}
+
+function record() {
+	const req = this.req
+	const elapsed = performance.now() - req.autumnStarted
+	const route = req.route ? req.baseUrl + String(req.route.path) : '(unmatched)'
+	const counts = histogram(req.method, route)
+	let bucket = 0
+	while (bucket < bounds.length && elapsed > bounds[bucket]) bucket++
+	counts[bucket]++
+	counts[sumIndex] += elapsed
+}
+
+function snapshot() {
+	const routes = []
+	for (const [method, paths] of methods) {
+		for (const [route, counts] of paths) routes.push({ method, path: route, buckets: Array.from(counts.subarray(0, sumIndex)), sum: counts[sumIndex] })
+	}
+	return JSON.stringify({ pid: process.pid, started, updated: Date.now(), bounds, routes })
+}
+
+function dump() {
+	fs.mkdir(folder, { recursive: true }, () => {
+		fs.writeFile(`${file}.tmp`, snapshot(), (error) => {
+			if (!error) fs.rename(`${file}.tmp`, file, () => {})
+		})
+	})
+}
+
+setInterval(dump, Number(process.env.AUTUMN_STATS_INTERVAL || 10000)).unref()
+process.on('exit', () => {
+	try {
+		fs.mkdirSync(folder, { recursive: true })
+		fs.writeFileSync(file, snapshot())
+	} catch (error) {}
+})
+
+module.exports = function routeStats(req, res, next) {
+	req.autumnStarted = performance.now()
+	res.on('finish', record)
+	next()
+}
+""")
+    middleware.close()
+    updateBundler('middleware', added=['routeStats'])
+
+def makeStats() -> None:
+    if os.path.isfile('./middlewares/routeStats.js'):
+        log('skipping the routeStats middleware as it already exists', False)
+        return
+    writeRouteStatsMiddleware()
+    log("routeStats middleware created, mount it with app.use(middlewares.routeStats) before app.use(routes)", True)
+
+def writeResponseCacheMiddleware() -> None:
+    middleware = open('./middlewares/responseCache.js', 'w')
+    middleware.write("""// in memory response cache: router.get('/path', middlewares.responseCache({ ttl: 30, headers: ['accept-language'] }), handler)
+// one bounded lru is shared by every route, CACHE_MAX_ENTRIES and CACHE_MAX_BYTES set its size
+const crypto = require('crypto')
+
+const maxEntries = Number(process.env.CACHE_MAX_ENTRIES || 10000)
+const maxBytes = Number(process.env.CACHE_MAX_BYTES || 64 * 1024 * 1024)
+const entries = new Map()
+const pending = new Map()
+let bytes = 0
+let hits = 0
+let misses = 0
+let coalesced = 0
+
+function remove(key) {
+	const entry = entries.get(key)
+	if (entry === undefined) return
+	entries.delete(key)
+	bytes -= entry.size
+}
+
+function lookup(key) {
+	const entry = entries.get(key)
+	if (entry === undefined) return undefined
+	if (entry.expires <= Date.now()) {
+		remove(key)
+		return undefined
+	}
+	// reinsert so the map stays ordered from least to most recently used
+	entries.delete(key)
+	entries.set(key, entry)
+	return entry
+}
+
+function store(key, entry) {
+	remove(key)
+	entries.set(key, entry)
+	bytes += entry.size
+	for (const oldest of entries.keys()) {
+		if (entries.size <= maxEntries && bytes <= maxBytes) break
+		remove(oldest)
+	}
+}
+
+function cacheable(res) {
+	if (res.statusCode !== 200 || res.getHeader('set-cookie') !== undefined) return false
+	const cacheControl = String(res.getHeader('cache-control') || '')
+	return !cacheControl.includes('no-store') && !cacheControl.includes('private')
+}
+
+function serve(req, res, entry) {
+	res.statusCode = entry.status
+	for (const name in entry.headers) res.setHeader(name, entry.headers[name])
+	res.setHeader('X-Cache', 'HIT')
+	const ifNoneMatch = req.headers['if-none-match']
+	if (ifNoneMatch && ifNoneMatch.split(',').some((tag) => tag.trim() === entry.etag || tag.trim() === '*')) {
+		res.statusCode = 304
+		res.removeHeader('content-length')
+		res.removeHeader('content-type')
+		return res.end()
+	}
+	res.end(req.method === 'HEAD' ? undefined : entry.body)
+}
+
+function capture(req, res, key, ttl, maxEntryBytes) {
+	const waiters = []
+	pending.set(key, waiters)
+	const chunks = []
+	let size = 0
+	let tooLarge = false
+	const write = res.write
+	const end = res.end
+
+	function collect(chunk, encoding) {
+		if (tooLarge || chunk === undefined || chunk === null || typeof chunk === 'function') return
+		const buffer = Buffer.isBuffer(chunk) ? chunk : Buffer.from(chunk, typeof encoding === 'string' ? encoding : 'utf8')
+		size += buffer.length
+		if (size > maxEntryBytes) {
+			tooLarge = true
+			chunks.length = 0
+		} else chunks.push(buffer)
+	}
+
+	res.write = function (chunk, encoding) {
+		collect(chunk, encoding)
+		return write.apply(this, arguments)
+	}
+	res.end = function (chunk, encoding) {
+		collect(chunk, encoding)
+		return end.apply(this, arguments)
+	}
+	res.setHeader('X-Cache', 'MISS')
+
+	function settle() {
+		res.removeListener('finish', settle)
+		res.removeListener('close', settle)
+		pending.delete(key)
+		let entry
+		if (res.writableFinished && !tooLarge && cacheable(res)) {
+			const body = Buffer.concat(chunks)
+			const headers = res.getHeaders()
+			delete headers['x-cache']
+			const etag = headers.etag || `"${crypto.createHash('sha1').update(body).digest('base64')}"`
+			headers.etag = etag
+			entry = { status: res.statusCode, headers, body, etag, size: body.length + key.length, expires: Date.now() + ttl * 1000 }
+			store(key, entry)
+		}
+		// concurrent requests for the same key waited on this one, they are answered from its response or run the handler themselves
+		for (const waiter of waiters) {
+			if (entry !== undefined) serve(waiter.req, waiter.res, entry)
+			else waiter.next()
+		}
+	}
+	res.on('finish', settle)
+	res.on('close', settle)
+}
+
+module.exports = function responseCache(options = {}) {
+	const ttl = options.ttl === undefined ? 60 : options.ttl
+	const headers = (options.headers || []).map((name) => name.toLowerCase())
+	const maxEntryBytes = Math.min(options.maxBytes || Infinity, maxBytes)
+
+	return function responseCache(req, res, next) {
+		if (req.method !== 'GET' && req.method !== 'HEAD') return next()
+		let key = `${req.method} ${req.originalUrl}`
+		for (const name of headers) key += `\\n${name}: ${req.headers[name] || ''}`
+
+		const entry = lookup(key)
+		if (entry !== undefined) {
+			hits++
+			return serve(req, res, entry)
+		}
+		const waiters = pending.get(key)
+		if (waiters !== undefined) {
+			coalesced++
+			waiters.push({ req, res, next })
+			return
+		}
+		misses++
+		capture(req, res, key, ttl, maxEntryBytes)
+		next()
+	}
+}
+
+module.exports.clear = function (prefix = '') {
+	for (const key of entries.keys()) {
+		if (key.slice(key.indexOf(' ') + 1).startsWith(prefix)) remove(key)
+	}
+}
+
+module.exports.stats = function () {
+	return { entries: entries.size, bytes, hits, misses, coalesced }
+}
+""")
+    middleware.close()
+    updateBundler('middleware', added=['responseCache'])
+
+def makeCache() -> None:
+    if os.path.isfile('./middlewares/responseCache.js'):
+        log('skipping the responseCache middleware as it already exists', False)
+        return
+    writeResponseCacheMiddleware()
+    log("responseCache middleware created, apply it per route with middlewares.responseCache({ ttl: 30 })", True)
+
+def histogramPercentile(bounds: list, buckets: list, rank: float):
+    total = sum(buckets)
+    if not total: return None
+    target = total * rank
+    seen = 0
+    for bucket, count in enumerate(buckets):
+        if count and seen + count >= target:
+            if bucket == len(bounds): return f'>{bounds[-1]}'
+            lower = bounds[bucket - 1] if bucket else 0
+            return round(lower + (bounds[bucket] - lower) * (target - seen) / count, 3)
+        seen += count
+    return None
+
+def statsColumns(bounds: list, entry: dict) -> list:
+    if not entry: return [0, 0, '', '', '', '']
+    requests = int(sum(entry['buckets']))
+    return [requests, round(entry['rps'], 1), round(entry['sum'] / requests, 3) if requests else ''] + [histogramPercentile(bounds, entry['buckets'], rank) for rank in [0.5, 0.95, 0.99]]
+
+def processIsAlive(pid: int) -> bool:
+    if os.name == 'nt': return True
+    try: os.kill(pid, 0)
+    except ProcessLookupError: return False
+    except PermissionError: pass
+    return True
+
+def stats() -> None:
+    merged = {}
+    bounds = None
+    if os.path.isdir(routeStatsPath):
+        for statsFileName in sorted(os.listdir(routeStatsPath)):
+            if not statsFileName.endswith('.json'): continue
+            try:
+                statsFile = open(os.path.join(routeStatsPath, statsFileName), 'r', encoding='utf-8')
+                snapshot = json.load(statsFile)
+                statsFile.close()
+            except (ValueError, OSError): continue
+            if not '--all' in sys.argv and not processIsAlive(snapshot['pid']): continue
+            if bounds is None: bounds = snapshot['bounds']
+            if snapshot['bounds'] != bounds:
+                log(f'skipping [{statsFileName}] as it was written with different histogram buckets', False)
+                continue
+            uptime = max(0.001, (snapshot['updated'] - snapshot['started']) / 1000)
+            for route in snapshot['routes']:
+                # stats written before paths were stringified hold regex routes as {} and array routes as lists
+                path = route['path'] if isinstance(route['path'], str) else json.dumps(route['path'])
+                entry = merged.setdefault((route['method'], path), {'buckets': [0] * len(route['buckets']), 'sum': 0, 'rps': 0})
+                entry['buckets'] = [total + count for total, count in zip(entry['buckets'], route['buckets'])]
+                entry['sum'] += route['sum']
+                entry['rps'] += sum(route['buckets']) / uptime
+    if not merged: log('no route statistics found, mount middlewares.routeStats (autumn make:stats) and send some traffic first' + ('' if '--all' in sys.argv else ', or use --all to include stopped processes'), False)
+
+    rows = [['METHOD', 'PATH', 'MIDDLEWARES', 'REQUESTS', 'RPS', 'AVG MS', 'P50 MS', 'P95 MS', 'P99 MS']]
+    listed = set()
+    for route in loadRoutes():
+        listed.add((route['method'], route['path']))
+        rows.append([route['method'], route['path'], ', '.join(route['middlewares'])] + statsColumns(bounds, merged.get((route['method'], route['path']))))
+    for (method, path), entry in merged.items():
+        if not (method, path) in listed: rows.append([method, path, ''] + statsColumns(bounds, entry))
+    writeTable(rows, '-', '|', '=')
+
+def optionValues(name: str) -> list:
+    return [sys.argv[index + 1] for index, argument in enumerate(sys.argv[:-1]) if argument == name]
+
+async def readResponse(reader: asyncio.StreamReader) -> tuple:
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ')[1])
+    headers = {}
+    for line in lines[1:]:
+        key, separator, value = line.partition(':')
+        if separator: headers[key.strip().lower()] = value.strip().lower()
+    if 'content-length' in headers: await reader.readexactly(int(headers['content-length']))
+    elif headers.get('transfer-encoding') == 'chunked':
+        while True:
+            size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0: break
+    elif status >= 200 and not status in [204, 304]:
+        await reader.read()
+        return status, False
+    return status, headers.get('connection') != 'close'
+
+async def benchWorker(target: dict, request: bytes, deadline: float, latencies: list, statuses: dict) -> None:
+    connection = None
+    while time.perf_counter() < deadline:
+        try:
+            if connection is None: connection = await asyncio.open_connection(target['host'], target['port'], ssl=target['ssl'])
+            reader, writer = connection
+            started = time.perf_counter()
+            writer.write(request)
+            status, keepAlive = await readResponse(reader)
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError, IndexError):
+            statuses['error'] = statuses.get('error', 0) + 1
+            keepAlive = False
+            await asyncio.sleep(0.01)
+        if not keepAlive and connection is not None:
+            connection[1].close()
+            connection = None
+    if connection is not None: connection[1].close()
+
+async def benchRoute(target: dict, path: str, concurrency: int, duration: float) -> dict:
+    request = f"GET {path} HTTP/1.1\r\nHost: {target['host']}:{target['port']}\r\nUser-Agent: autumn-bench\r\nConnection: keep-alive\r\n\r\n".encode('latin-1')
+    latencies = []
+    statuses = {}
+    started = time.perf_counter()
+    await asyncio.gather(*(benchWorker(target, request, started + duration, latencies, statuses) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    percentile = lambda rank: round(latencies[min(len(latencies) - 1, int(len(latencies) * rank))] * 1000, 3) if latencies else None
+    return {
+        'requests': len(latencies),
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50': percentile(0.5),
+        'p95': percentile(0.95),
+        'p99': percentile(0.99),
+        'errors': sum(count for status, count in statuses.items() if status == 'error' or status >= 400),
+        'statuses': {str(status): count for status, count in statuses.items()},
+    }
+
+def waitForPort(host: str, port: int, timeout: float, process=None) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None: return False
+        try:
+            socket.create_connection((host, port), 0.5).close()
+            return True
+        except OSError: time.sleep(0.1)
+    return False
+
+def benchDelta(current: float, previous: float) -> str:
+    if current is None or not previous: return ''
+    return f'{(current - previous) / previous * 100:+.1f}%'
+
+def bench() -> bool:
+    env = {**readEnv(), **os.environ}
+    host = env.get('HOST', '0.0.0.0')
+    target = {'host': '127.0.0.1' if host in ['0.0.0.0', '::', ''] else host, 'port': int(env.get('PORT', '5000')), 'ssl': None}
+    if env.get('PROT') == 'https':
+        target['ssl'] = ssl.create_default_context()
+        if '--insecure' in sys.argv: target['ssl'].check_hostname, target['ssl'].verify_mode = False, ssl.CERT_NONE
+    concurrency = int(optionValue('--concurrency', '32'))
+    duration = float(optionValue('--duration', '5'))
+    pathFilter = optionValue('--filter', '*')
+    params = dict(param.partition('=')[::2] for param in optionValues('--param'))
+
+    divider('selecting routes')
+    paths = []
+    for route in loadRoutes():
+        if not route['method'] in ['GET', 'ALL'] or not fnmatch.fnmatch(route['path'], pathFilter): continue
+        pattern = routePattern(route['path']) if route['literal'] else None
+        if pattern is None:
+            log(f"skipping [{route['path']}] as it can not be expanded into a url", False)
+            continue
+        path = '/' + '/'.join(params.get(segment[1:], '1') if segment.startswith(':') else segment for segment in route['path'][1:].split('/'))
+        if not path in paths: paths.append(path)
+    if not paths:
+        log('no GET routes to benchmark', False)
+        return False
+    log(f'{len(paths)} routes selected, {concurrency} connections for {duration}s each', True)
+
+    app = None
+    if not '--running' in sys.argv:
+        divider('starting application')
+        app = subprocess.Popen(['node', 'app'], env={**os.environ, 'NODE_ENV': 'production'}, stdout=subprocess.DEVNULL)
+        if not waitForPort(target['host'], target['port'], 15, app):
+            if app.poll() is None: stopProcess(app)
+            else: log(f'application exited with code {app.returncode} before listening', False)
+            log(f"application did not start listening on [{target['host']}:{target['port']}]", False)
+            return False
+    results = {}
+    try:
+        divider('benchmarking')
+        for path in paths:
+            results[path] = asyncio.run(benchRoute(target, path, concurrency, duration))
+            log(f"[{path}] {results[path]['rps']} rps, p99 {results[path]['p99']}ms", True)
+    finally:
+        if app: stopProcess(app)
+
+    previousResults = {}
+    comparePath = optionValue('--compare')
+    if comparePath:
+        previous = open(comparePath, 'r', encoding='utf-8')
+        previousResults = json.load(previous)['routes']
+        previous.close()
+    rows = [['PATH', 'REQUESTS', 'RPS', 'P50 MS', 'P95 MS', 'P99 MS', 'ERRORS'] + (['RPS DELTA', 'P99 DELTA'] if comparePath else [])]
+    for path, result in results.items():
+        row = [path, result['requests'], result['rps'], result['p50'], result['p95'], result['p99'], result['errors']]
+        if comparePath: row += [benchDelta(result['rps'], previousResults.get(path, {}).get('rps')), benchDelta(result['p99'], previousResults.get(path, {}).get('p99'))]
+        rows.append(row)
+    writeTable(rows, '-', '|', '=')
+
+    savePath = optionValue('--save', f"./.autumn/bench/{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(savePath)), exist_ok=True)
+    writeAtomic(savePath, json.dumps({'created': datetime.datetime.now().isoformat(), 'target': f"{env.get('PROT', 'http')}://{target['host']}:{target['port']}", 'concurrency': concurrency, 'duration': duration, 'routes': results}, indent=2))
+    log(f'results saved to [{savePath}]', True)
+    return True
+
+workerReadyTimeout = 30
+workerStopTimeout = 15
+workerMaxBackoff = 30
+
+def spawnWorker(listener: socket.socket) -> dict:
+    readyRead, readyWrite = os.pipe()
+    process = subprocess.Popen(['node', 'app'], env={**os.environ, 'NODE_ENV': 'production', 'AUTUMN_LISTEN_FD': str(listener.fileno()), 'AUTUMN_READY_FD': str(readyWrite)}, pass_fds=(listener.fileno(), readyWrite))
+    os.close(readyWrite)
+    return {'process': process, 'ready': readyRead, 'started': time.monotonic()}
+
+def waitForWorker(worker: dict) -> bool:
+    deadline = time.monotonic() + workerReadyTimeout
+    output = b''
+    while time.monotonic() < deadline:
+        readable, _, _ = select.select([worker['ready']], [], [], max(0, deadline - time.monotonic()))
+        if not readable: break
+        chunk = os.read(worker['ready'], 64)
+        if not chunk: return False
+        output += chunk
+        if b'ready' in output: return True
+    return False
+
+def stopWorker(worker: dict) -> None:
+    if worker['process'].poll() is None:
+        worker['process'].terminate()
+        try: worker['process'].wait(workerStopTimeout)
+        except subprocess.TimeoutExpired:
+            worker['process'].kill()
+            worker['process'].wait()
+    os.close(worker['ready'])
+
+def startProd() -> None:
+    if os.name == 'nt' or not os.path.isfile('./app.js'):
+        os.system('npm run start:prod')
+        return
+    app = open('./app.js', 'r', encoding='utf-8')
+    supportsSupervisor = 'AUTUMN_LISTEN_FD' in app.read()
+    app.close()
+    if not supportsSupervisor:
+        log('app.js does not read AUTUMN_LISTEN_FD, starting a single process (see the app.js generated by autumn scaffold)', False)
+        os.system('npm run start:prod')
+        return
+
+    env = {**readEnv(), **os.environ}
+    workerCount = int(optionValue('--workers', str(os.cpu_count() or 1)))
+    listener = socket.create_server((env.get('HOST', '0.0.0.0'), int(env.get('PORT', '5000'))), backlog=511)
+    listener.set_inheritable(True)
+    signals = []
+    for signalNumber in [signal.SIGHUP, signal.SIGTERM, signal.SIGINT]: signal.signal(signalNumber, lambda signalNumber, frame: signals.append(signalNumber))
+
+    log(f"supervising {workerCount} workers on [{env.get('HOST', '0.0.0.0')}:{env.get('PORT', '5000')}] (SIGHUP reloads, ctrl + c stops)", True)
+    workers = [spawnWorker(listener) for _ in range(workerCount)]
+    backoffs = [0] * workerCount
+    restartAt = [None] * workerCount
+    try:
+        while True:
+            if signal.SIGTERM in signals or signal.SIGINT in signals: break
+            if signal.SIGHUP in signals:
+                signals.clear()
+                log('rolling reload started', True)
+                for slot in range(workerCount):
+                    replacement = spawnWorker(listener)
+                    if not waitForWorker(replacement):
+                        stopWorker(replacement)
+                        log(f'rolling reload aborted, replacement for worker {slot} did not become ready', False)
+                        break
+                    if restartAt[slot] is None: stopWorker(workers[slot])
+                    workers[slot], backoffs[slot], restartAt[slot] = replacement, 0, None
+                else: log('rolling reload finished', True)
+            now = time.monotonic()
+            for slot, worker in enumerate(workers):
+                if restartAt[slot] is not None:
+                    if now >= restartAt[slot]:
+                        workers[slot], restartAt[slot] = spawnWorker(listener), None
+                    continue
+                exitCode = worker['process'].poll()
+                if exitCode is None: continue
+                os.close(worker['ready'])
+                backoffs[slot] = 1 if now - worker['started'] > workerMaxBackoff else min(workerMaxBackoff, max(1, backoffs[slot] * 2))
+                restartAt[slot] = now + backoffs[slot]
+                log(f'worker {slot} exited with code {exitCode}, restarting in {backoffs[slot]}s', False)
+            time.sleep(0.2)
+    finally:
+        log('stopping workers', True)
+        for slot, worker in enumerate(workers):
+            if restartAt[slot] is None: stopWorker(worker)
+        listener.close()
+
+inotifyMask = 0x8 | 0x40 | 0x80 | 0x100 | 0x200
+inotifyIsFolder = 0x40000000
+inotifyStructureChange = 0x40 | 0x80 | 0x100 | 0x200
+watchIgnoredFolders = ['node_modules', '.git', '.autumn', 'build']
+watchReloadFree = ['static', 'views']
+watchExtensions = ('.js', '.cjs', '.mjs', '.json', '.env')
+debounceSeconds = 0.15
+debounceLimitSeconds = 1
+
+def addWatches(libc, inotify: int, root: str, watches: dict) -> None:
+    for folder, folderNames, fileNames in os.walk(root):
+        folderNames[:] = [folderName for folderName in folderNames if not folderName in watchIgnoredFolders]
+        watch = libc.inotify_add_watch(inotify, os.fsencode(folder), inotifyMask)
+        if watch >= 0: watches[watch] = os.path.normpath(folder)
+
+def readWatchEvents(libc, inotify: int, watches: dict, timeout: float) -> list:
+    events = []
+    deadline = None
+    while select.select([inotify], [], [], timeout)[0]:
+        deadline = deadline or time.monotonic() + debounceLimitSeconds
+        buffer = os.read(inotify, 65536)
+        offset = 0
+        while offset < len(buffer):
+            watch, mask, cookie, length = struct.unpack_from('iIII', buffer, offset)
+            name = os.fsdecode(buffer[offset + 16:offset + 16 + length].rstrip(b'\0'))
+            offset += 16 + length
+            if not watch in watches: continue
+            path = os.path.normpath(os.path.join(watches[watch], name))
+            if mask & inotifyIsFolder and mask & (0x80 | 0x100): addWatches(libc, inotify, path, watches)
+            events.append((path, mask))
+        timeout = min(debounceSeconds, max(0, deadline - time.monotonic()))
+    return events
+
+def isTemporaryFile(path: str) -> bool:
+    name = os.path.basename(path)
+    return name.endswith('.tmp') or name.endswith('~') or name.startswith('.#') or name.endswith('.swp')
+
+def verifyBundlers(kinds: list) -> list:
+    written = []
+    for kind in kinds:
+        folder = artifacts[kind]['folder']
+        bundlerPath = f'./{folder}/index.js'
+        if not os.path.isfile(bundlerPath): continue
+        names = [fileName[:-3] for fileName in os.listdir(folder) if fileName.endswith('.js') and not fileName in ['index.js', routeDispatcherName]]
+        bundler = open(bundlerPath, 'r', encoding='utf-8')
+        bundlerTokens = tokenize(bundler.read())
+        bundler.close()
+        linked = [token[1][3:-1] for token in bundlerTokens if token[0] == 'string' and token[1][1:3] == './']
+        added = [name for name in names if not name in linked]
+        removed = [name for name in linked if not name in names]
+        if added or removed:
+            updateBundler(kind, added=added, removed=removed)
+            written.append(os.path.normpath(bundlerPath))
+            for name in added: log(f'[{name}] {kind} linked', True)
+            for name in removed: log(f'[{name}] {kind} unlinked', True)
+    return written
+
+def spawnDevServer():
+    return subprocess.Popen(['node', 'app'], env={**os.environ, 'NODE_ENV': 'development'})
+
+def stopProcess(process) -> None:
+    if process.poll() is not None: return
+    process.terminate()
+    try: process.wait(5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+def startDev() -> None:
+    libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True) if sys.platform.startswith('linux') else None
+    inotify = libc.inotify_init1(0o2000000) if libc else -1
+    if inotify < 0:
+        log('inotify is not available, falling back to nodemon', False)
+        os.system('npm run start:dev')
+        return
+
+    watches = {}
+    addWatches(libc, inotify, '.', watches)
+    log(f'watching {len(watches)} folders, changes in [{", ".join(watchReloadFree)}] do not restart the application (ctrl + c to stop)', True)
+    bundleFolders = {artifacts[kind]['folder']: kind for kind in artifacts}
+    signal.signal(signal.SIGTERM, lambda signalNumber, frame: sys.exit(0))
+    process = spawnDevServer()
+    try:
+        while True:
+            events = readWatchEvents(libc, inotify, watches, None)
+            changed = [(path, mask) for path, mask in events if not isTemporaryFile(path)]
+            changedPaths = set(path for path, mask in changed)
+            restart = False
+            structureChanged = []
+            for path, mask in changed:
+                topFolder = path.split(os.sep)[0] if os.sep in path else ''
+                if topFolder in watchReloadFree or not (path.endswith(watchExtensions) or os.path.basename(path) == '.env'): continue
+                restart = True
+                if topFolder in bundleFolders and mask & inotifyStructureChange and os.path.basename(path) != 'index.js': structureChanged.append(bundleFolders[topFolder])
+            if structureChanged:
+                written = verifyBundlers(list(dict.fromkeys(structureChanged)))
+                if written: readWatchEvents(libc, inotify, watches, debounceSeconds)
+            if not restart:
+                if changed: log(f'{len(changedPaths)} files changed, no restart needed', True)
+                continue
+            log(f'{len(changedPaths)} files changed, restarting', True)
+            stopProcess(process)
+            process = spawnDevServer()
+    except KeyboardInterrupt: pass
+    finally:
+        stopProcess(process)
+        os.close(inotify)
+
+def dispatch(arguments: list) -> bool:
+    global muted
+    sys.argv = ['autumn'] + arguments
+    muted = sessionMuted or '--mute' in arguments
+    if not arguments: log('missing parameters, type autumn commands to list all available commands', False)
+    elif arguments[0] in sessionCommands and bundlerEdits is not None: log(f'[{arguments[0]}] can not be used inside a running session', False)
+    # commands return False when they are called with missing or invalid arguments
+    elif arguments[0] in commandTable:
+        # only make: and delete: queue bundler edits, every other command reads bundlers and routes from disk
+        if bundlerEdits and not arguments[0].startswith(('make:', 'delete:')): flushBundlers()
+        return commandTable[arguments[0]]() is not False
     else: log('invalid parameter, type autumn commands to list all available commands', False)
-except IndexError:
-    log('missing parameters, type autumn commands to list all available commands', False)
\ No newline at end of file
+    return False
+
+def runSession(lines, stopOnError: bool) -> bool:
+    global bundlerEdits, sessionMuted
+    sessionMuted = '--mute' in sys.argv
+    bundlerEdits = {}
+    try:
+        for line in lines:
+            try: arguments = shlex.split(line, comments=True)
+            except ValueError as error:
+                log(f'skipping [{line.strip()}] as it can not be parsed: {error}', False)
+                if stopOnError: return False
+                continue
+            if arguments[:1] == ['autumn']: arguments = arguments[1:]
+            if not arguments: continue
+            if arguments[0] in ['exit', 'quit']: break
+            if arguments[0] == 'flush':
+                flushBundlers()
+                continue
+            try: succeeded = dispatch(arguments)
+            except Exception as error:
+                log(f'[{arguments[0]}] failed: {error}', False)
+                succeeded = False
+            except KeyboardInterrupt:
+                print()
+                log(f'[{arguments[0]}] interrupted', False)
+                succeeded = False
+            if not succeeded and stopOnError: return False
+        return True
+    finally:
+        flushBundlers()
+        bundlerEdits = None
+
+def promptLines():
+    while True:
+        try: yield input('autumn> ')
+        except EOFError: return
+        except KeyboardInterrupt: print()
+
+def shell() -> None:
+    log('autumn shell started, type exit to quit (bundlers are written on flush and on exit)', True)
+    runSession(promptLines(), False)
+
+def run() -> bool:
+    scriptPath = next((argument for argument in sys.argv[2:] if not argument.startswith('--')), '-')
+    if scriptPath != '-' and not os.path.isfile(scriptPath):
+        log(f'skipping [{scriptPath}] as the script does not exist', False)
+        return False
+    script = sys.stdin if scriptPath == '-' else open(scriptPath, 'r', encoding='utf-8')
+    lines = script.readlines()
+    if script is not sys.stdin: script.close()
+    return runSession(lines, True)
+
+commandTable = {
+    'commands': commands,
+    'scaffold': scaffold,
+
+    'start:prod': startProd,
+    'start:dev': startDev,
+
+    'make:helper': makeHelper,
+    'make:middleware': makeMiddleware,
+    'make:model': makeModel,
+    'make:route': makeRoute,
+    'make:validator': makeValidator,
+    'make:cache': makeCache,
+    'make:stats': makeStats,
+
+    'delete:helper': deleteHelper,
+    'delete:middleware': deleteMiddleware,
+    'delete:model': deleteModel,
+    'delete:route': deleteRoute,
+    'delete:validator': deleteValidator,
+
+    'list:routes': listRoutes,
+    'list:unused': listUnused,
+    'build:routes': buildRoutes,
+    'build:bundlers': buildBundlers,
+    'build:validators': buildValidators,
+    'build:static': buildStatic,
+    'bench': bench,
+    'stats': stats,
+
+    'snapshot': snapshot,
+
+    'shell': shell,
+    'run': run,
+}
+sessionCommands = ['shell', 'run', 'start:prod', 'start:dev']
+
+def writeProfile() -> None:
+    ended = time.perf_counter()
+    boundaries = [started for caption, started in profilePhases[1:]] + [ended]
+    profile = open(profilePath, 'w', encoding='utf-8')
+    json.dump({'seconds': ended - profilePhases[0][1], 'phases': [{'phase': caption, 'seconds': boundary - started} for (caption, started), boundary in zip(profilePhases, boundaries)]}, profile)
+    profile.close()
+
+if __name__ == '__main__':
+    if profilePath: atexit.register(writeProfile)
+    if not dispatch(sys.argv[1:]): sys.exit(1)
@@ -0,0 +1,153 @@
+import sys
+import os
+import json
+import contextlib
+import time
+import shutil
+import hashlib
+import platform
+import datetime
+import argparse
+import tempfile
+import subprocess
+
+autumnPath = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'autumn.py')
+
+def runAutumn(projectPath: str, arguments: list, stdin: str = None) -> dict:
+    profilePath = os.path.join(projectPath, '.autumn-profile.json')
+    with contextlib.suppress(FileNotFoundError): os.remove(profilePath)
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, autumnPath] + arguments + ['--mute'], cwd=projectPath, env={**os.environ, 'AUTUMN_PROFILE': profilePath, 'COLUMNS': '160'}, stdin=subprocess.PIPE if stdin else subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if stdin: process.stdin.write(stdin.encode())
+    if process.stdin: process.stdin.close()
+    _, status, usage = os.wait4(process.pid, 0)
+    seconds = time.perf_counter() - started
+    errors = process.stderr.read().decode(errors='replace')
+    process.stderr.close()
+    exitCode = os.waitstatus_to_exitcode(status)
+    if exitCode: raise RuntimeError(f'autumn {" ".join(arguments)} failed with code {exitCode}: {errors}')
+    phases = []
+    if os.path.isfile(profilePath):
+        profile = open(profilePath, 'r', encoding='utf-8')
+        phases = json.load(profile)['phases']
+        profile.close()
+    # ru_maxrss is reported in kilobytes on linux and in bytes on macos
+    return {'seconds': round(seconds, 4), 'maxRssKb': usage.ru_maxrss // (1024 if sys.platform == 'darwin' else 1), 'phases': phases}
+
+def writeManifest(projectPath: str, fileName: str, names: list) -> str:
+    manifestPath = os.path.join(projectPath, fileName)
+    manifest = open(manifestPath, 'w', encoding='utf-8')
+    manifest.write('\n'.join(names))
+    manifest.close()
+    return manifestPath
+
+def writeRouteFiles(projectPath: str, fileNames: list, routesPerFile: int) -> None:
+    for fileName in fileNames:
+        routes = []
+        for routeIndex in range(routesPerFile):
+            method = ['get', 'post', 'put', 'delete'][routeIndex % 4]
+            routes.append(f"""router.{method}(
+	'/{fileName}/r{routeIndex}/:id',
+	middlewares.m{routeIndex % 7},
+	async (req, res) => {{
+		const value = `${{req.params.id}}/{routeIndex}`
+		res.json({{ value, ok: /^[a-z]+$/.test(value) }})
+	}}
+)""")
+        routeFile = open(os.path.join(projectPath, 'routes', f'{fileName}.js'), 'w', encoding='utf-8')
+        routeFile.write("const express = require('express')\nconst middlewares = require('../middlewares')\n\nconst router = express.Router()\n\n" + '\n'.join(routes) + '\n\nmodule.exports = router')
+        routeFile.close()
+
+def benchSize(size: int, routesPerFile: int, keep: bool) -> list:
+    projectPath = tempfile.mkdtemp(prefix=f'autumn-bench-{size}-')
+    results = []
+
+    def record(command: str, result: dict) -> None:
+        results.append({'size': size, 'command': command, **result})
+        print(f"  {size:>6} {command:<40} {result['seconds']:>9.3f}s {result['maxRssKb']:>8} KB", flush=True)
+
+    try:
+        # scaffold without npm: package.json and node_modules already exist so only autumn's own work is measured
+        package = open(os.path.join(projectPath, 'package.json'), 'w')
+        package.write('{}')
+        package.close()
+        os.mkdir(os.path.join(projectPath, 'node_modules'))
+        record('scaffold', runAutumn(projectPath, ['scaffold', '--no-editor']))
+
+        names = [f'n{index}' for index in range(size)]
+        for kind in ['helper', 'middleware', 'model', 'validator']:
+            record(f'make:{kind} (manifest of {size})', runAutumn(projectPath, [f'make:{kind}', '--manifest', writeManifest(projectPath, 'names.txt', names), '--no-editor']))
+        routeFileNames = [f'f{index}' for index in range(max(1, size // routesPerFile))]
+        record(f'make:route (manifest of {len(routeFileNames)})', runAutumn(projectPath, ['make:route', '--manifest', writeManifest(projectPath, 'routes.txt', routeFileNames), '--no-editor']))
+        writeRouteFiles(projectPath, routeFileNames, routesPerFile)
+
+        record('list:routes cold', runAutumn(projectPath, ['list:routes']))
+        record('list:routes warm', runAutumn(projectPath, ['list:routes']))
+        record('list:routes --json warm', runAutumn(projectPath, ['list:routes', '--json']))
+        os.utime(os.path.join(projectPath, 'routes', f'{routeFileNames[0]}.js'))
+        record('list:routes one file touched', runAutumn(projectPath, ['list:routes']))
+        record('commands', runAutumn(projectPath, ['commands']))
+        record('build:routes', runAutumn(projectPath, ['build:routes']))
+
+        record('make:route (single, large autoloader)', runAutumn(projectPath, ['make:route', 'extra', '--no-editor']))
+        record('delete:route (single, large autoloader)', runAutumn(projectPath, ['delete:route', 'extra']))
+        record('make:helper (single, large bundler)', runAutumn(projectPath, ['make:helper', 'extra', '--no-editor']))
+        record('delete:helper (single, large bundler)', runAutumn(projectPath, ['delete:helper', 'extra']))
+        record(f'delete:helper (manifest of {size // 2})', runAutumn(projectPath, ['delete:helper', '--manifest', writeManifest(projectPath, 'names.txt', names[:size // 2])]))
+        script = '\n'.join(f'make:model s{index} --no-editor' for index in range(min(size, 1000)))
+        record(f'run (script of {min(size, 1000)} make:model)', runAutumn(projectPath, ['run', '-'], script))
+    finally:
+        if keep: print(f'  project kept in [{projectPath}]')
+        else: shutil.rmtree(projectPath, ignore_errors=True)
+    return results
+
+def compareReports(results: list, previousPath: str, threshold: float, minimumDelta: float) -> int:
+    previous = open(previousPath, 'r', encoding='utf-8')
+    previousResults = {(result['size'], result['command']): result for result in json.load(previous)['results']}
+    previous.close()
+    regressions = 0
+    print(f'\ncomparing with [{previousPath}] (threshold {threshold:.0f}%)')
+    for result in results:
+        before = previousResults.get((result['size'], result['command']))
+        if not before or not before['seconds']: continue
+        change = (result['seconds'] - before['seconds']) / before['seconds'] * 100
+        if change > threshold and result['seconds'] - before['seconds'] > minimumDelta:
+            regressions += 1
+            print(f"  regression {result['size']:>6} {result['command']:<40} {before['seconds']:.3f}s -> {result['seconds']:.3f}s ({change:+.1f}%)")
+    print(f'  {regressions} regressions')
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='times autumn commands end to end and per divider() phase on synthetic projects')
+    parser.add_argument('--sizes', default='10,1000,50000', help='comma separated number of routes, helpers, middlewares, models and validators per project')
+    parser.add_argument('--routes-per-file', type=int, default=10)
+    parser.add_argument('--output', default='bench_report.json')
+    parser.add_argument('--compare', help='previous report to check for regressions')
+    parser.add_argument('--threshold', type=float, default=20, help='slowdown in percent reported as a regression')
+    parser.add_argument('--minimum-delta', type=float, default=0.05, help='slowdowns below this many seconds are ignored as noise')
+    parser.add_argument('--keep', action='store_true', help='keep the generated projects')
+    arguments = parser.parse_args()
+
+    autumnFile = open(autumnPath, 'rb')
+    autumnHash = hashlib.sha256(autumnFile.read()).hexdigest()
+    autumnFile.close()
+    results = []
+    for size in [int(size) for size in arguments.sizes.split(',')]:
+        print(f'size {size}')
+        results += benchSize(size, arguments.routes_per_file, arguments.keep)
+
+    report = open(arguments.output, 'w', encoding='utf-8')
+    json.dump({
+        'created': datetime.datetime.now().isoformat(),
+        'autumn': autumnHash,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'results': results,
+    }, report, indent=2)
+    report.close()
+    print(f'\nreport written to [{arguments.output}]')
+    if arguments.compare and compareReports(results, arguments.compare, arguments.threshold, arguments.minimum_delta): sys.exit(1)
+
+if __name__ == '__main__':
+    main()